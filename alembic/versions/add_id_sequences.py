@@ -0,0 +1,27 @@
+"""add id sequences shared by all shards
+
+Revision ID: id_sequences
+Revises: project_counters
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'id_sequences'
+down_revision = 'project_counters'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Primary only. Rows are created on first use, continuing after the
+    # highest id found on any shard.
+    op.create_table('id_sequences',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('next_id', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+def downgrade():
+    op.drop_table('id_sequences')
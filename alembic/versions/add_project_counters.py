@@ -0,0 +1,40 @@
+"""add per-organization project counters
+
+Revision ID: project_counters
+Revises: projects_search
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic
+revision = 'project_counters'
+down_revision = 'projects_search'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Runs on the primary only; the other shards get the table from
+    # `python -m app.core.sharding schema` and their counts from
+    # `python -m app.core.project_counters`
+    op.create_table('project_counters',
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM('active', 'archived', 'completed', name='projectstatus', create_type=False),
+            nullable=False
+        ),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+        sa.PrimaryKeyConstraint('organization_id', 'status')
+    )
+    op.execute(
+        "INSERT INTO project_counters (organization_id, status, count) "
+        "SELECT organization_id, status, count(*) FROM projects "
+        "WHERE status IS NOT NULL GROUP BY organization_id, status"
+    )
+
+def downgrade():
+    op.drop_table('project_counters')
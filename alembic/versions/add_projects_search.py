@@ -0,0 +1,36 @@
+"""add projects full-text search index
+
+Revision ID: projects_search
+Revises: tenant_shards
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.core.search import POSTGRES_DDL, SQLITE_DDL
+
+# revision identifiers, used by Alembic
+revision = 'projects_search'
+down_revision = 'tenant_shards'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Same statements the app runs on shards, so the two cannot drift apart
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+    elif bind.dialect.name == 'sqlite':
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_projects_search', table_name='projects')
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER projects_fts_update")
+        op.execute("DROP TRIGGER projects_fts_delete")
+        op.execute("DROP TRIGGER projects_fts_insert")
+        op.execute("DROP TABLE projects_fts")
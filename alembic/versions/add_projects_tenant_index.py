@@ -0,0 +1,26 @@
+"""add projects tenant listing index
+
+Revision ID: projects_tenant_index
+Revises: initial
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'projects_tenant_index'
+down_revision = 'initial'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index(
+        'ix_projects_org_status_created',
+        'projects',
+        ['organization_id', 'status', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+def downgrade():
+    op.drop_index('ix_projects_org_status_created', table_name='projects')
@@ -0,0 +1,32 @@
+"""add tenant shard directory
+
+Revision ID: tenant_shards
+Revises: projects_tenant_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic
+revision = 'tenant_shards'
+down_revision = 'projects_tenant_index'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Runs on the primary only; tables on the other shards are created by
+    # `python -m app.core.sharding schema`
+    op.create_table('tenant_shards',
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('shard', sa.String(), nullable=False),
+        sa.Column('read_only', sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+        sa.PrimaryKeyConstraint('organization_id')
+    )
+    op.create_index(op.f('ix_tenant_shards_shard'), 'tenant_shards', ['shard'], unique=False)
+
+def downgrade():
+    op.drop_index(op.f('ix_tenant_shards_shard'), table_name='tenant_shards')
+    op.drop_table('tenant_shards')
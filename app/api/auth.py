@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from app.core.database import get_db
+from app.core.last_login import last_login_buffer
+from app.core.tenant_cache import bump_generation
+from app.core.sharding import shard_router
 from app.core.security import (
-    verify_password, 
-    get_password_hash, 
+    verify_password_async, 
+    get_password_hash_async, 
     create_access_token
 )
 from app.schemas.user import UserCreate, UserLogin, Token, UserResponse
@@ -36,26 +39,37 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
             detail="Email already registered"
         )
     
-    # Create organization
-    org = Organization(
-        name=user_data.organization_name,
-        subdomain=user_data.subdomain
+    # Create organization (RETURNING gives the id without a flush round trip)
+    org_id = await db.scalar(
+        insert(Organization)
+        .values(
+            name=user_data.organization_name,
+            subdomain=user_data.subdomain
+        )
+        .returning(Organization.id)
     )
-    db.add(org)
-    await db.flush()  # Get org ID without committing
     
     # Create user
-    user = User(
-        email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
-        full_name=user_data.full_name,
-        organization_id=org.id,
-        role="admin"
+    user = await db.scalar(
+        insert(User)
+        .values(
+            email=user_data.email,
+            password_hash=await get_password_hash_async(user_data.password),
+            full_name=user_data.full_name,
+            organization_id=org_id,
+            role="admin"
+        )
+        .returning(User)
     )
-    db.add(user)
+    
+    # Pick the shard that will hold the new tenant's data
+    await shard_router.assign_new_tenant(db, org_id)
     
     await db.commit()
-    await db.refresh(user)
+    
+    # Also keeps the new user's first authenticated requests off replicas
+    # that may not have it yet
+    await bump_generation("users", org_id)
     
     return user
 
@@ -65,7 +79,7 @@ async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
         select(User).where(User.email == user_data.email)
     )
     
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not user or not await verify_password_async(user_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -77,14 +91,8 @@ async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="Inactive user"
         )
     
-    # Update last login
-    from sqlalchemy import update
-    await db.execute(
-        update(User)
-        .where(User.id == user.id)
-        .values(last_login="now()")
-    )
-    await db.commit()
+    # Update last login (written behind in batches)
+    last_login_buffer.record(user.id)
     
     # Create token
     access_token = create_access_token(
@@ -1,28 +1,36 @@
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.database import get_db
+from app.core.logging import organization_id_var
+from app.core.replicas import replica_router
+from app.core.sharding import shard_router, PRIMARY_SHARD
 from app.core.security import decode_token
+from app.core.principal_cache import Principal, principal_cache
 from app.models.user import User, UserRole
 
 security = HTTPBearer()
 
 async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[AsyncSession, Depends(get_db)]
-) -> User:
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+) -> Principal:
     token_data = decode_token(credentials.credentials)
     
-    user = await db.scalar(
-        select(User).where(
-            User.id == token_data.user_id,
-            User.is_active == True
-        )
-    )
+    user = principal_cache.get(token_data.user_id)
+    if user is None:
+        # Only a principal cache miss needs a session, and a replica will do
+        async with replica_router.session(PRIMARY_SHARD, token_data.organization_id) as db:
+            db_user = await db.scalar(
+                select(User).where(
+                    User.id == token_data.user_id,
+                    User.is_active == True
+                )
+            )
+        if db_user:
+            user = Principal.from_user(db_user)
+            principal_cache.set(user)
     
-    if not user:
+    if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive"
@@ -34,11 +42,12 @@ async def get_current_user(
             detail="Invalid organization access"
         )
     
+    organization_id_var.set(user.organization_id)
     return user
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)]
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -47,11 +56,51 @@ async def get_current_active_user(
     return current_user
 
 def require_role(required_role: UserRole):
-    def role_checker(current_user: Annotated[User, Depends(get_current_active_user)]):
+    def role_checker(current_user: Annotated[Principal, Depends(get_current_active_user)]):
         if current_user.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions"
             )
         return current_user
-    return role_checker
\ No newline at end of file
+    return role_checker
+
+async def get_read_db(
+    current_user: Annotated[Principal, Depends(get_current_active_user)]
+):
+    # Read-only session for primary-database tables (users, organizations)
+    async with replica_router.session(PRIMARY_SHARD, current_user.organization_id) as session:
+        yield session
+
+async def writable_placement(
+    organization_id: int,
+    detail: str = "Organization data is being migrated, retry shortly"
+):
+    # Writes are refused while the organization is being moved between shards
+    placement = await shard_router.placement(organization_id)
+    if placement.read_only:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(int(shard_router.directory_ttl) or 1)}
+        )
+    return placement
+
+async def get_tenant_db(
+    current_user: Annotated[Principal, Depends(get_current_active_user)]
+):
+    # Session on the shard holding the caller's organization, for writes
+    placement = await writable_placement(current_user.organization_id)
+    # Marked up front so the window covers reads racing the response
+    await replica_router.mark_write(current_user.organization_id)
+    async with shard_router.sessionmakers[placement.shard]() as session:
+        yield session
+
+async def get_tenant_read_db(
+    current_user: Annotated[Principal, Depends(get_current_active_user)]
+):
+    # Read-only session on a replica of the tenant's shard; stays available
+    # while the tenant is being moved
+    placement = await shard_router.placement(current_user.organization_id)
+    async with replica_router.session(placement.shard, current_user.organization_id) as session:
+        yield session
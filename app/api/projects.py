@@ -1,96 +1,648 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import Optional
-from app.core.database import get_db
-from app.api.deps import get_current_active_user, require_role
-from app.models.user import User, UserRole
+from sqlalchemy import select, insert, update, delete, bindparam, func, literal, tuple_
+from sqlalchemy.dialects import sqlite
+from datetime import datetime
+from typing import List, Optional
+from app.api.deps import get_current_active_user, require_role, get_tenant_db, get_tenant_read_db, writable_placement
+from app.core.sharding import shard_router
+from app.core.replicas import replica_router
+from app.core.principal_cache import Principal
+from app.models.user import UserRole
 from app.models.project import Project, ProjectStatus
 from app.schemas.project import (
     ProjectCreate, 
     ProjectUpdate, 
     ProjectResponse, 
-    ProjectList
+    ProjectList,
+    ProjectSearchResults,
+    ProjectStats,
+    ProjectBulkUpdateItem,
+    ProjectBulkDelete,
+    ProjectBulkItemResult,
+    ProjectBulkResult,
+    ProjectFileFormat,
+    ProjectImportError,
+    ProjectImportResult
 )
-from app.core.redis_client import redis_client
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.tenant_cache import bump_generation, tenant_cache_prefix
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.conditional import make_etag, etag_matches, not_modified
+from app.core.instrumentation import timed_serialization
+from app.core.search import search_query
+from app.core.project_counters import adjust_project_counts, project_counts
+from app.core.ids import id_allocator
+from collections import Counter
+import csv
+import hashlib
+import io
+import itertools
+import json
+import logging
 import math
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# SQLite stores server-side CURRENT_TIMESTAMP values without fractional seconds,
+# so a whole-second cursor value has to be bound in that same text form to
+# compare equal to the rows it came from.
+_SQLITE_SECONDS_DATETIME = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+async def _projects_version(db: AsyncSession, organization_id: int) -> str:
+    # Identifies the state of a tenant's projects for cache keys and ETags.
+    # The generation alone does when it lives in the shared tier; without one
+    # it is per process and misses writes made by other workers, so it is
+    # combined with a fingerprint of the rows: inserts and deletes move the
+    # count/max id, updates move max(updated_at)
+    cache_prefix = await tenant_cache_prefix("projects", organization_id)
+    if cache.l2_enabled:
+        return cache_prefix
+    fingerprint = (await db.execute(
+        select(func.count(Project.id), func.max(Project.id), func.max(Project.updated_at)).where(
+            Project.organization_id == organization_id
+        )
+    )).one()
+    return ":".join([cache_prefix, *(str(part) for part in fingerprint)])
+
+def _cursor_created_at(value: datetime):
+    type_ = Project.created_at.type
+    if value.microsecond == 0:
+        type_ = type_.with_variant(_SQLITE_SECONDS_DATETIME, "sqlite")
+    return literal(value, type_)
+
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_data: ProjectCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_tenant_db)
 ):
-    project = Project(
-        **project_data.model_dump(),
-        organization_id=current_user.organization_id,
-        created_by=current_user.id
+    # INSERT ... RETURNING gives back server defaults (created_at) without a refresh
+    [project_id] = await id_allocator.allocate(Project.__table__)
+    project = await db.scalar(
+        insert(Project)
+        .values(
+            **project_data.model_dump(),
+            id=project_id,
+            organization_id=current_user.organization_id,
+            created_by=current_user.id
+        )
+        .returning(Project)
     )
-    db.add(project)
+    await adjust_project_counts(db, current_user.organization_id, {project.status: 1})
     await db.commit()
-    await db.refresh(project)
     
     # Clear cache for this org's projects
-    await redis_client.delete(f"projects:org:{current_user.organization_id}")
+    await bump_generation("projects", current_user.organization_id)
     
     return project
 
-@router.get("/", response_model=ProjectList)
-async def list_projects(
-    status: Optional[ProjectStatus] = None,
-    page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1, le=100),
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
-):
-    # Try cache first
-    cache_key = f"projects:org:{current_user.organization_id}:page:{page}:limit:{limit}:status:{status}"
-    cached = await redis_client.get(cache_key)
-    if cached:
-        return ProjectList(**cached)
-    
+async def _load_project_page(
+    db: AsyncSession,
+    organization_id: int,
+    status: Optional[ProjectStatus],
+    page: int,
+    limit: int,
+    cursor: Optional[tuple],
+    include_total: bool
+) -> bytes:
     # Build query
     query = select(Project).where(
-        Project.organization_id == current_user.organization_id
+        Project.organization_id == organization_id
     )
     
     if status:
         query = query.where(Project.status == status)
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    # Totals come from the maintained per-status counters, not a COUNT(*)
+    total = None
+    if include_total:
+        counts = await project_counts(db, organization_id)
+        total = counts[status] if status else sum(counts.values())
     
-    # Apply pagination
-    offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit).order_by(Project.created_at.desc())
+    # Apply pagination: seek past the cursor row when given, offset otherwise
+    query = query.order_by(Project.created_at.desc(), Project.id.desc())
+    if cursor:
+        created_at, last_id = cursor
+        query = query.where(
+            tuple_(Project.created_at, Project.id) < tuple_(_cursor_created_at(created_at), last_id)
+        )
+    else:
+        query = query.offset((page - 1) * limit)
     
-    # Execute
-    result = await db.execute(query)
+    # Execute, fetching one extra row to know whether another page follows
+    result = await db.execute(query.limit(limit + 1))
     projects = result.scalars().all()
     
+    next_cursor = None
+    if len(projects) > limit:
+        projects = projects[:limit]
+        next_cursor = encode_cursor(projects[-1].created_at, projects[-1].id)
+    
     # Prepare response
     response = ProjectList(
         projects=projects,
         total=total,
         page=page,
         limit=limit,
-        total_pages=math.ceil(total / limit) if limit > 0 else 0
+        total_pages=math.ceil(total / limit) if total is not None else None,
+        next_cursor=next_cursor
+    )
+    with timed_serialization():
+        return response.model_dump_json().encode()
+
+@router.get("/", response_model=ProjectList)
+async def list_projects(
+    request: Request,
+    status: Optional[ProjectStatus] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = True,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    cursor = decode_cursor(after) if after else None
+    
+    cache_prefix = await _projects_version(db, current_user.organization_id)
+    cache_key = (
+        f"{cache_prefix}:page:{page}:limit:{limit}"
+        f":status:{status}:after:{after}:total:{include_total}"
     )
     
-    # Cache for 60 seconds
-    await redis_client.set(cache_key, response.model_dump(), expire=60)
+    # The key embeds the tenant's version, so it changes whenever the body can
+    etag = make_etag(cache_key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    return response
+    # Serve the cached, already rendered body; on a miss only one concurrent
+    # request per key queries the database while the others wait for (or get
+    # a stale copy of) its result
+    body = await cache.get_or_compute(
+        cache_key,
+        lambda: _load_project_page(
+            db,
+            current_user.organization_id,
+            status,
+            page,
+            limit,
+            cursor,
+            include_total
+        ),
+        expire=settings.PROJECTS_CACHE_TTL_SECONDS,
+        stale_for=settings.PROJECTS_CACHE_STALE_SECONDS
+    )
+    
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
+@router.get("/stats", response_model=ProjectStats)
+async def project_stats(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    # Read straight from the per-status counters; revalidated like list_projects
+    cache_prefix = await _projects_version(db, current_user.organization_id)
+    etag = make_etag(cache_prefix, "stats")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    counts = await project_counts(db, current_user.organization_id)
+    response.headers["ETag"] = etag
+    return ProjectStats(total=sum(counts.values()), by_status=counts)
+
+async def _load_search_page(
+    db: AsyncSession,
+    organization_id: int,
+    q: str,
+    status: Optional[ProjectStatus],
+    page: int,
+    limit: int
+) -> bytes:
+    query = search_query(db.get_bind().dialect.name, organization_id, q, status)
+    projects = []
+    if query is not None:
+        result = await db.execute(query.offset((page - 1) * limit).limit(limit + 1))
+        projects = result.scalars().all()
+    
+    response = ProjectSearchResults(
+        query=q,
+        projects=projects[:limit],
+        page=page,
+        limit=limit,
+        has_more=len(projects) > limit
+    )
+    with timed_serialization():
+        return response.model_dump_json().encode()
+
+@router.get("/search", response_model=ProjectSearchResults)
+async def search_projects(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[ProjectStatus] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_tenant_read_db)
+):
+    # Ranked matches from the full-text index, cached and revalidated like
+    # list_projects; the query text is hashed to keep keys bounded
+    cache_prefix = await _projects_version(db, current_user.organization_id)
+    q_digest = hashlib.blake2b(q.encode(), digest_size=12).hexdigest()
+    cache_key = f"{cache_prefix}:search:{q_digest}:page:{page}:limit:{limit}:status:{status}"
+    
+    etag = make_etag(cache_key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    body = await cache.get_or_compute(
+        cache_key,
+        lambda: _load_search_page(db, current_user.organization_id, q, status, page, limit),
+        expire=settings.PROJECTS_CACHE_TTL_SECONDS,
+        stale_for=settings.PROJECTS_CACHE_STALE_SECONDS
+    )
+    
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
+def _check_batch_size(count: int):
+    if count > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch exceeds {settings.BULK_MAX_ITEMS} items"
+        )
+
+@router.post("/bulk", response_model=ProjectBulkResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_projects(
+    projects_data: List[ProjectCreate],
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    _check_batch_size(len(projects_data))
+    if not projects_data:
+        return ProjectBulkResult(results=[])
+    
+    # One multi-row INSERT ... RETURNING for the whole batch
+    project_ids = await id_allocator.allocate(Project.__table__, len(projects_data))
+    rows = [
+        {
+            **project_data.model_dump(),
+            "id": project_id,
+            "organization_id": current_user.organization_id,
+            "created_by": current_user.id
+        }
+        for project_data, project_id in zip(projects_data, project_ids)
+    ]
+    # Without sort_by_parameter_order: SQLAlchemy cannot trust the ids we
+    # assign as a sentinel and would fall back to one INSERT per row, so the
+    # rows are put back in request order by id instead
+    result = await db.scalars(insert(Project).returning(Project), rows)
+    inserted = {project.id: project for project in result.all()}
+    projects = [inserted[project_id] for project_id in project_ids]
+    await adjust_project_counts(
+        db, current_user.organization_id, Counter(project.status for project in projects)
+    )
+    await db.commit()
+    
+    await bump_generation("projects", current_user.organization_id)
+    
+    return ProjectBulkResult(results=[
+        ProjectBulkItemResult(index=index, id=project.id, result="created", project=project)
+        for index, project in enumerate(projects)
+    ])
+
+@router.patch("/bulk", response_model=ProjectBulkResult)
+async def bulk_update_projects(
+    projects_data: List[ProjectBulkUpdateItem],
+    current_user: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    _check_batch_size(len(projects_data))
+    projects_table = Project.__table__
+    
+    # executemany needs the same columns in every parameter set, so group the
+    # items by the fields they change and run one UPDATE per group
+    groups = {}
+    has_changes = []
+    for item in projects_data:
+        update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+        has_changes.append(bool(update_data))
+        if update_data:
+            groups.setdefault(tuple(sorted(update_data)), []).append(
+                {"b_id": item.id, **{f"b_{field}": value for field, value in update_data.items()}}
+            )
+    
+    # Statuses before the change, for the counters; locked so a concurrent
+    # update cannot change them in between
+    ids = {item.id for item in projects_data}
+    old_statuses = {}
+    if any("status" in fields for fields in groups):
+        old_statuses = dict((await db.execute(
+            select(Project.id, Project.status)
+            .where(Project.id.in_(ids), Project.organization_id == current_user.organization_id)
+            .with_for_update()
+        )).all())
+    
+    for fields, params in groups.items():
+        stmt = (
+            update(projects_table)
+            .where(
+                projects_table.c.id == bindparam("b_id"),
+                projects_table.c.organization_id == current_user.organization_id
+            )
+            .values({
+                field: bindparam(f"b_{field}", type_=projects_table.c[field].type)
+                for field in fields
+            })
+        )
+        await db.execute(stmt, params)
+    
+    # Read back every addressed row of this tenant in one query
+    result = await db.scalars(
+        select(Project).where(
+            Project.id.in_(ids),
+            Project.organization_id == current_user.organization_id
+        ).execution_options(populate_existing=True)
+    )
+    projects = {project.id: project for project in result.all()}
+    deltas = Counter()
+    for project_id, old_status in old_statuses.items():
+        if projects[project_id].status != old_status:
+            deltas[old_status] -= 1
+            deltas[projects[project_id].status] += 1
+    await adjust_project_counts(db, current_user.organization_id, deltas)
+    await db.commit()
+    
+    if groups:
+        await bump_generation("projects", current_user.organization_id)
+    
+    return ProjectBulkResult(results=[
+        ProjectBulkItemResult(
+            index=index,
+            id=item.id,
+            # Items without fields to set run no UPDATE
+            result=(
+                "not_found" if item.id not in projects
+                else "updated" if changed
+                else "unchanged"
+            ),
+            project=projects.get(item.id)
+        )
+        for index, (item, changed) in enumerate(zip(projects_data, has_changes))
+    ])
+
+@router.delete("/bulk", response_model=ProjectBulkResult)
+async def bulk_delete_projects(
+    delete_data: ProjectBulkDelete,
+    current_user: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    _check_batch_size(len(delete_data.ids))
+    if not delete_data.ids:
+        return ProjectBulkResult(results=[])
+    
+    result = await db.execute(
+        delete(Project)
+        .where(
+            Project.id.in_(delete_data.ids),
+            Project.organization_id == current_user.organization_id
+        )
+        .returning(Project.id, Project.status)
+    )
+    deleted = dict(result.all())
+    await adjust_project_counts(
+        db,
+        current_user.organization_id,
+        {project_status: -count for project_status, count in Counter(deleted.values()).items()}
+    )
+    await db.commit()
+    
+    if deleted:
+        await bump_generation("projects", current_user.organization_id)
+    
+    return ProjectBulkResult(results=[
+        ProjectBulkItemResult(
+            index=index,
+            id=project_id,
+            result="deleted" if project_id in deleted else "not_found"
+        )
+        for index, project_id in enumerate(delete_data.ids)
+    ])
+
+# Columns streamed by the export, in output order
+_EXPORT_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.status,
+    Project.organization_id,
+    Project.created_by,
+    Project.created_at,
+    Project.updated_at
+)
+_EXPORT_FIELDS = [column.key for column in _EXPORT_COLUMNS]
+
+def _export_value(value):
+    if isinstance(value, ProjectStatus):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+async def _stream_export(
+    organization_id: int,
+    status: Optional[ProjectStatus],
+    file_format: ProjectFileFormat
+):
+    query = select(*_EXPORT_COLUMNS).where(
+        Project.organization_id == organization_id
+    )
+    if status:
+        query = query.where(Project.status == status)
+    query = query.order_by(Project.id).execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+    
+    if file_format == ProjectFileFormat.CSV:
+        yield (",".join(_EXPORT_FIELDS) + "\r\n").encode()
+    
+    # The response outlives the request's dependencies, so the stream owns
+    # its session. Rows come off a server-side cursor one chunk at a time as
+    # plain tuples; no ORM objects or response models are built.
+    placement = await shard_router.placement(organization_id)
+    async with replica_router.session(placement.shard, organization_id) as session:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            if file_format == ProjectFileFormat.CSV:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([_export_value(value) for value in row] for row in rows)
+                yield buffer.getvalue().encode()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(_EXPORT_FIELDS, map(_export_value, row)))) + "\n"
+                    for row in rows
+                ).encode()
+
+@router.get("/export")
+async def export_projects(
+    format: ProjectFileFormat = ProjectFileFormat.NDJSON,
+    status: Optional[ProjectStatus] = None,
+    current_user: Principal = Depends(get_current_active_user)
+):
+    media_type = "text/csv" if format == ProjectFileFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_export(current_user.organization_id, status, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="projects.{format.value}"'}
+    )
+
+def _iter_import_rows(upload, file_format: ProjectFileFormat):
+    # Lazily yields (line number, raw row) from the spooled upload; a row that
+    # cannot be decoded is yielded as the exception instead. utf-8-sig drops
+    # the byte order mark Excel puts in front of CSV exports.
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    if file_format == ProjectFileFormat.CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ""}
+    else:
+        for line_number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as exc:
+                yield line_number, exc
+
+def _parse_import_batch(rows, batch_size: int) -> list:
+    # Runs in a worker thread: reads and validates up to batch_size rows,
+    # returning (line number, ProjectCreate or error message) pairs
+    parsed = []
+    for line_number, data in itertools.islice(rows, batch_size):
+        if isinstance(data, Exception):
+            parsed.append((line_number, f"Invalid JSON: {data}"))
+            continue
+        try:
+            parsed.append((line_number, ProjectCreate.model_validate(data)))
+        except ValidationError as exc:
+            parsed.append((line_number, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                for error in exc.errors()
+            )))
+    return parsed
+
+@router.post("/import", response_model=ProjectImportResult)
+async def import_projects(
+    file: UploadFile = File(...),
+    format: Optional[ProjectFileFormat] = None,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_tenant_db)
+):
+    if format is None:
+        is_csv = (file.filename or "").lower().endswith(".csv")
+        format = ProjectFileFormat.CSV if is_csv else ProjectFileFormat.NDJSON
+    
+    # The upload is spooled to disk by the multipart parser; it is read and
+    # validated one batch at a time, and each batch is inserted with a single
+    # executemany INSERT in its own transaction, so memory stays bounded by
+    # IMPORT_BATCH_SIZE whatever the file size
+    rows = _iter_import_rows(file.file, format)
+    inserted = failed = batches = 0
+    errors = []
+    try:
+        while True:
+            try:
+                parsed = await run_in_threadpool(_parse_import_batch, rows, settings.IMPORT_BATCH_SIZE)
+            except (UnicodeDecodeError, csv.Error) as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Malformed upload after {inserted} inserted rows: {exc}"
+                )
+            if not parsed:
+                break
+            
+            values = []
+            for line_number, item in parsed:
+                if isinstance(item, str):
+                    failed += 1
+                    if len(errors) < settings.IMPORT_MAX_ERRORS:
+                        errors.append(ProjectImportError(row=line_number, error=item))
+                    continue
+                values.append({
+                    **item.model_dump(),
+                    "organization_id": current_user.organization_id,
+                    "created_by": current_user.id
+                })
+            
+            if values:
+                # A move of the tenant may have frozen its writes since the
+                # upload began; rows committed to the old shard after the
+                # move copied it would be lost
+                await writable_placement(
+                    current_user.organization_id,
+                    f"Organization data is being migrated after {inserted} inserted rows, retry the rest shortly"
+                )
+                project_ids = await id_allocator.allocate(Project.__table__, len(values))
+                for value, project_id in zip(values, project_ids):
+                    value["id"] = project_id
+                await db.execute(insert(Project), values)
+                await adjust_project_counts(
+                    db, current_user.organization_id, Counter(value["status"] for value in values)
+                )
+                await db.commit()
+                inserted += len(values)
+            batches += 1
+            
+            logger.info(
+                "Project import org=%s batch=%s inserted=%s failed=%s",
+                current_user.organization_id, batches, inserted, failed
+            )
+    finally:
+        # Committed batches stay even if a later one fails
+        if inserted:
+            await bump_generation("projects", current_user.organization_id)
+    
+    return ProjectImportResult(
+        inserted=inserted,
+        failed=failed,
+        batches=batches,
+        errors=errors,
+        errors_truncated=failed > len(errors)
+    )
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_tenant_read_db)
 ):
+    # Any write to the tenant's projects bumps the generation, so with a
+    # shared one a matching ETag is answered without touching the database;
+    # a per-process generation can miss other workers' writes, so then the
+    # ETag is taken from the row itself
+    cache_prefix = await tenant_cache_prefix("projects", current_user.organization_id)
+    if cache.l2_enabled:
+        etag = make_etag(cache_prefix, project_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
     project = await db.scalar(
         select(Project).where(
             Project.id == project_id,
@@ -104,62 +656,87 @@ async def get_project(
             detail="Project not found"
         )
     
+    if not cache.l2_enabled:
+        # Every field, as updated_at only has whole seconds on SQLite
+        etag = make_etag(cache_prefix, ProjectResponse.model_validate(project).model_dump_json())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
+    response.headers["ETag"] = etag
     return project
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
-    current_user: User = Depends(require_role(UserRole.ADMIN)),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_tenant_db)
 ):
-    project = await db.scalar(
-        select(Project).where(
-            Project.id == project_id,
-            Project.organization_id == current_user.organization_id
-        )
+    tenant_project = (
+        Project.id == project_id,
+        Project.organization_id == current_user.organization_id
     )
     
+    # Update fields with a single UPDATE ... RETURNING scoped to the tenant;
+    # a status change also needs the previous status for the counters
+    update_data = project_data.model_dump(exclude_unset=True)
+    if update_data:
+        old_status = None
+        if "status" in update_data:
+            old_status = await db.scalar(
+                select(Project.status).where(*tenant_project).with_for_update()
+            )
+        project = await db.scalar(
+            update(Project)
+            .where(*tenant_project)
+            .values(**update_data)
+            .returning(Project)
+        )
+        if project and old_status is not None and project.status != old_status:
+            await adjust_project_counts(
+                db, current_user.organization_id, {old_status: -1, project.status: 1}
+            )
+    else:
+        project = await db.scalar(select(Project).where(*tenant_project))
+    
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    # Update fields
-    update_data = project_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(project, field, value)
-    
     await db.commit()
-    await db.refresh(project)
     
     # Clear cache
-    await redis_client.delete(f"projects:org:{current_user.organization_id}")
+    if update_data:
+        await bump_generation("projects", current_user.organization_id)
     
     return project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: int,
-    current_user: User = Depends(require_role(UserRole.ADMIN)),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_tenant_db)
 ):
-    project = await db.scalar(
-        select(Project).where(
+    deleted = (await db.execute(
+        delete(Project)
+        .where(
             Project.id == project_id,
             Project.organization_id == current_user.organization_id
         )
-    )
+        .returning(Project.status)
+        .execution_options(synchronize_session=False)
+    )).first()
     
-    if not project:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    await db.delete(project)
+    await adjust_project_counts(db, current_user.organization_id, {deleted.status: -1})
     await db.commit()
     
     # Clear cache
-    await redis_client.delete(f"projects:org:{current_user.organization_id}")
\ No newline at end of file
+    await bump_generation("projects", current_user.organization_id)
\ No newline at end of file
@@ -1,20 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from typing import List
-from app.core.database import get_db
-from app.api.deps import get_current_active_user, require_role
+from app.api.deps import get_current_active_user, require_role, get_read_db
+from app.core.principal_cache import Principal
 from app.models.user import User, UserRole
 from app.schemas.user import UserResponse
 from app.core.security import get_password_hash
+from app.core.conditional import make_etag, etag_matches, not_modified
+from app.core.tenant_cache import tenant_cache_prefix
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
-    current_user: User = Depends(require_role(UserRole.ADMIN)),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(require_role(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_read_db)
 ):
+    # The users generation is bumped by every write made through the API, so
+    # two changes within the same second (the resolution of updated_at on
+    # SQLite) still get different ETags; the fingerprint catches changes
+    # made outside the API: inserts and deletes move the count/max id,
+    # updates move max(updated_at)
+    cache_prefix = await tenant_cache_prefix("users", current_user.organization_id)
+    fingerprint = (await db.execute(
+        select(func.count(User.id), func.max(User.id), func.max(User.updated_at)).where(
+            User.organization_id == current_user.organization_id
+        )
+    )).one()
+    etag = make_etag(cache_prefix, *fingerprint)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    response.headers["ETag"] = etag
     users = await db.scalars(
         select(User).where(
             User.organization_id == current_user.organization_id
@@ -24,6 +44,6 @@ async def list_users(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     return current_user
\ No newline at end of file
@@ -0,0 +1,245 @@
+import json
+import random
+import struct
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.instrumentation import record_cache_lookup
+from app.core.lru import TTLCache
+from app.core.metrics import registry
+from app.core.redis_client import redis_client
+from app.core.singleflight import SingleFlight
+
+# Header of get_or_compute entries: the wall-clock time they stop being fresh
+_FRESH_UNTIL = struct.Struct("!d")
+
+class MemoryBackend:
+    # In-process stand-in for RedisClient (same async surface) used by tests
+    # and local runs; values expire lazily on read.
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], Any]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def _live(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get_raw(self, key: str):
+        return self._live(key)
+
+    async def set_raw(self, key: str, value, expire: int = 300):
+        self._data[key] = (time.monotonic() + expire, value)
+
+    async def get(self, key: str):
+        value = self._live(key)
+        return json.loads(value) if value else None
+
+    async def set(self, key: str, value, expire: int = 300):
+        await self.set_raw(key, json.dumps(value), expire)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self._data[key] = (None, str(value))
+        return value
+
+    async def ping(self) -> bool:
+        return True
+
+    def clear(self):
+        self._data.clear()
+
+class TieredCache:
+    # L1: bounded in-process LRU (entries, bytes and TTL bounded).
+    # L2: optional shared backend (Redis, or MemoryBackend in tests).
+    # get/set take JSON-serializable values and L1 holds the decoded object, so
+    # a hit costs no network hop and no json.loads; get_bytes/set_bytes store
+    # payloads that are already serialized (e.g. rendered response bodies).
+    def __init__(self, l1: TTLCache, backend=None):
+        self.l1 = l1
+        self.backend = backend
+        self.l2_hits = 0
+        self.l2_misses = 0
+        # Generation counters when there is no shared backend. Kept out of the
+        # LRU so they can never be evicted back to an old value, and started
+        # from a per-process random base so two workers never hand out the
+        # same generation (and hence the same ETag) for different data.
+        self._counters: Dict[str, int] = {}
+        self._counter_base = random.getrandbits(32)
+        self.flights = SingleFlight()
+        self.stale_served = 0
+
+    @property
+    def l2_enabled(self) -> bool:
+        return self.backend is not None and self.backend.enabled
+
+    async def get(self, key: str):
+        value = self.l1.get(key)
+        if value is not None:
+            record_cache_lookup(True)
+            return value
+
+        if not self.l2_enabled:
+            record_cache_lookup(False)
+            return None
+
+        raw = await self.backend.get_raw(key)
+        record_cache_lookup(raw is not None)
+        if raw is None:
+            self.l2_misses += 1
+            return None
+
+        self.l2_hits += 1
+        value = json.loads(raw)
+        self.l1.set(key, value, ttl=self.l1.ttl, size=len(raw))
+        return value
+
+    async def set(self, key: str, value, expire: int = 300):
+        raw = json.dumps(value)
+        self.l1.set(key, value, ttl=min(expire, self.l1.ttl), size=len(raw))
+        if self.l2_enabled:
+            await self.backend.set_raw(key, raw, expire)
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        value = self.l1.get(key)
+        if value is not None:
+            record_cache_lookup(True)
+            return value
+
+        if not self.l2_enabled:
+            record_cache_lookup(False)
+            return None
+
+        value = await self.backend.get_raw(key)
+        record_cache_lookup(value is not None)
+        if value is None:
+            self.l2_misses += 1
+            return None
+
+        self.l2_hits += 1
+        self.l1.set(key, value, ttl=self.l1.ttl, size=len(value))
+        return value
+
+    async def set_bytes(self, key: str, value: bytes, expire: int = 300):
+        self.l1.set(key, value, ttl=min(expire, self.l1.ttl), size=len(value))
+        if self.l2_enabled:
+            await self.backend.set_raw(key, value, expire)
+
+    async def delete(self, key: str):
+        self.l1.pop(key)
+        if self.l2_enabled:
+            await self.backend.delete(key)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[bytes]],
+        expire: int = 300,
+        stale_for: int = 0
+    ) -> bytes:
+        # Read-through of serialized payloads with single-flight recompute on
+        # miss. Entries are kept stale_for seconds past their freshness window;
+        # while one caller recomputes an expired entry, concurrent callers get
+        # the stale payload instead of queueing behind it.
+        entry = await self.get_bytes(key)
+        if entry is not None:
+            (fresh_until,) = _FRESH_UNTIL.unpack_from(entry)
+            if fresh_until > time.time():
+                return entry[_FRESH_UNTIL.size:]
+            if self.flights.in_flight(key):
+                self.stale_served += 1
+                return entry[_FRESH_UNTIL.size:]
+
+        async def load():
+            value = await compute()
+            await self.set_bytes(
+                key,
+                _FRESH_UNTIL.pack(time.time() + expire) + value,
+                expire=expire + stale_for
+            )
+            return value
+
+        return await self.flights.do(key, load)
+
+    # Counters always go to the shared tier when there is one, so every worker
+    # sees the same value.
+    async def get_counter(self, key: str) -> int:
+        if self.l2_enabled:
+            return int(await self.backend.get_raw(key) or 0)
+        return self._counters.get(key, self._counter_base)
+
+    async def incr(self, key: str) -> int:
+        if self.l2_enabled:
+            return await self.backend.incr(key)
+        self._counters[key] = self._counters.get(key, self._counter_base) + 1
+        return self._counters[key]
+
+    def clear(self):
+        self.l1.clear()
+        self._counters.clear()
+
+def _build_backend():
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryBackend()
+    if settings.CACHE_BACKEND == "redis":
+        return redis_client
+    return None
+
+cache = TieredCache(
+    l1=TTLCache(
+        maxsize=settings.CACHE_L1_MAX_ENTRIES,
+        ttl=settings.CACHE_L1_TTL_SECONDS,
+        maxbytes=settings.CACHE_L1_MAX_BYTES
+    ),
+    backend=_build_backend()
+)
+
+def _tier_requests():
+    return [
+        ({"tier": "l1", "result": "hit"}, cache.l1.hits),
+        ({"tier": "l1", "result": "miss"}, cache.l1.misses),
+        ({"tier": "l2", "result": "hit"}, cache.l2_hits),
+        ({"tier": "l2", "result": "miss"}, cache.l2_misses),
+    ]
+
+registry.counter(
+    "cache_requests_total",
+    "Cache lookups by tier and result",
+    callback=_tier_requests
+)
+registry.counter(
+    "cache_coalesced_requests_total",
+    "Cache misses that awaited another caller's in-flight recompute",
+    callback=lambda: cache.flights.coalesced
+)
+registry.counter(
+    "cache_stale_served_total",
+    "Requests answered with a stale entry while it was being recomputed",
+    callback=lambda: cache.stale_served
+)
+registry.counter(
+    "cache_l1_evictions_total",
+    "Entries evicted from the in-process cache to respect its bounds",
+    callback=lambda: cache.l1.evictions
+)
+registry.gauge(
+    "cache_l1_entries",
+    "Entries held in the in-process cache",
+    callback=lambda: len(cache.l1)
+)
+registry.gauge(
+    "cache_l1_bytes",
+    "Serialized size of the entries held in the in-process cache",
+    callback=lambda: cache.l1.currbytes
+)
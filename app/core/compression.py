@@ -0,0 +1,150 @@
+import time
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import settings
+from app.core.instrumentation import record_compression_time
+from app.core.metrics import registry
+
+try:
+    import brotli
+except ImportError:  # in requirements; only gzip is offered without it
+    brotli = None
+
+# Response compression negotiated from Accept-Encoding. Bodies sent in one
+# piece are compressed only from minimum_size bytes up; streamed bodies
+# (exports) are always compressed, flushing after every chunk so clients
+# keep receiving rows as they are produced.
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+compression_bytes = registry.counter(
+    "http_compression_bytes_total",
+    "Response body bytes before (input) and after (output) compression, by encoding"
+)
+
+def supported_encodings() -> list:
+    # In order of preference when the client accepts several equally
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    # Highest q-value wins; "*" covers codings not listed and q=0 refuses one
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in supported_encodings():
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 31: zlib stream with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", "").lower():
+        return False
+    return headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    def _encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(settings.COMPRESSION_BROTLI_QUALITY)
+        return _GzipEncoder(settings.COMPRESSION_GZIP_LEVEL)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+
+        def compress(body: bytes, final: bool) -> bytes:
+            started = time.perf_counter()
+            output = encoder.compress(body, final)
+            record_compression_time(time.perf_counter() - started)
+            compression_bytes.inc(len(body), encoding=encoding, stage="input")
+            compression_bytes.inc(len(output), encoding=encoding, stage="output")
+            return output
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows what to do
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                start, start_message = start_message, None
+                headers = MutableHeaders(raw=list(start.get("headers", [])))
+                if not _compressible(headers) or (not more_body and len(body) < settings.COMPRESSION_MINIMUM_SIZE):
+                    await send(start)
+                    await send(message)
+                    return
+
+                encoder = self._encoder(encoding)
+                body = compress(body, final=not more_body)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                # The compressed body is a different representation
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                await send({**start, "headers": headers.raw})
+            elif encoder is not None:
+                body = compress(body, final=not more_body)
+            else:
+                await send(message)
+                return
+
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
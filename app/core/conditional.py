@@ -0,0 +1,21 @@
+import hashlib
+from fastapi import Request, Response, status
+
+# Helpers for conditional GET (ETag / If-None-Match).
+
+def make_etag(*parts) -> str:
+    raw = "|".join(str(part) for part in parts).encode()
+    return '"' + hashlib.blake2b(raw, digest_size=12).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so ignore any W/ prefix
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -9,14 +9,113 @@ class Settings(BaseSettings):
     # Default to SQLite
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./multitenant.db")
     
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    
+    # SQLite connection PRAGMAs
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # Negative values are KiB, positive values are pages
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    
     # JWT
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    
+    # Password hashing worker pool
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    
+    # Authenticated principal cache (per process)
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
     
     # Redis (optional)
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL", None)
     
+    # Cache: in-process L1 in front of an optional shared L2
+    # ("redis" uses REDIS_URL when set, "memory" is a local stand-in, "none" disables L2)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "redis")
+    CACHE_L1_MAX_ENTRIES: int = int(os.getenv("CACHE_L1_MAX_ENTRIES", "10000"))
+    CACHE_L1_MAX_BYTES: int = int(os.getenv("CACHE_L1_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_L1_TTL_SECONDS: int = int(os.getenv("CACHE_L1_TTL_SECONDS", "30"))
+    PROJECTS_CACHE_TTL_SECONDS: int = int(os.getenv("PROJECTS_CACHE_TTL_SECONDS", "60"))
+    PROJECTS_CACHE_STALE_SECONDS: int = int(os.getenv("PROJECTS_CACHE_STALE_SECONDS", "30"))
+    
+    # last_login write-behind buffer
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL_SECONDS", "5"))
+    LAST_LOGIN_MAX_PENDING: int = int(os.getenv("LAST_LOGIN_MAX_PENDING", "10000"))
+    
+    # Bulk project endpoints
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+    
+    # Project counters: seconds between recounts of the reconciler process
+    # (python -m app.core.project_counters --loop)
+    PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS: float = float(os.getenv("PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS", "3600"))
+    
+    # Tenant sharding: extra shards as "name=url,..."; the primary DATABASE_URL
+    # is always the shard named "primary"
+    SHARD_URLS: str = os.getenv("SHARD_URLS", "")
+    # Shard of tenants without a directory entry (e.g. created before sharding)
+    SHARD_DEFAULT: str = os.getenv("SHARD_DEFAULT", "primary")
+    # Shards new tenants are spread over (default: the SHARD_URLS shards)
+    SHARD_NEW_TENANTS: str = os.getenv("SHARD_NEW_TENANTS", "")
+    SHARD_DIRECTORY_TTL_SECONDS: float = float(os.getenv("SHARD_DIRECTORY_TTL_SECONDS", "30"))
+    SHARD_DIRECTORY_CACHE_SIZE: int = int(os.getenv("SHARD_DIRECTORY_CACHE_SIZE", "100000"))
+    # Project ids reserved from the primary per round trip (ids are unique across shards)
+    ID_BLOCK_SIZE: int = int(os.getenv("ID_BLOCK_SIZE", "100"))
+    
+    # Read replicas as "shard=url,..." (repeat a shard name per replica)
+    READ_REPLICA_URLS: str = os.getenv("READ_REPLICA_URLS", "")
+    READ_REPLICA_STRATEGY: str = os.getenv("READ_REPLICA_STRATEGY", "round_robin")  # round_robin | least_connections
+    READ_REPLICA_CHECK_INTERVAL_SECONDS: float = float(os.getenv("READ_REPLICA_CHECK_INTERVAL_SECONDS", "5"))
+    # Reads for an organization stay on the primary this long after a write
+    # (across workers only with a shared cache: CACHE_BACKEND=redis and REDIS_URL)
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    
+    # Per-organization rate limiting
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | redis
+    RATE_LIMIT_REQUESTS_PER_SECOND: float = float(os.getenv("RATE_LIMIT_REQUESTS_PER_SECOND", "50"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "100"))
+    RATE_LIMIT_MAX_CONCURRENT: int = int(os.getenv("RATE_LIMIT_MAX_CONCURRENT", "20"))
+    RATE_LIMIT_BULK_COST: int = int(os.getenv("RATE_LIMIT_BULK_COST", "10"))
+    
+    # Response compression: gzip, plus brotli when the brotli package is installed
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "True").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    
+    # Health checks
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "1"))
+    HEALTH_CACHE_SECONDS: float = float(os.getenv("HEALTH_CACHE_SECONDS", "2"))
+    # Report not-ready once this fraction of pool_size + max_overflow is checked out
+    HEALTH_POOL_SATURATION_THRESHOLD: float = float(os.getenv("HEALTH_POOL_SATURATION_THRESHOLD", "0.9"))
+    
+    # Logging
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json | text
+    LOG_FILE: str = os.getenv("LOG_FILE", "logs/app.log")
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    # Rotate on a schedule (e.g. "midnight", "H") instead of by size when set
+    LOG_ROTATE_WHEN: str = os.getenv("LOG_ROTATE_WHEN", "")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+    LOG_SQL_SAMPLE_RATE: float = float(os.getenv("LOG_SQL_SAMPLE_RATE", "1.0"))
+    
     # App
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     
@@ -1,14 +1,108 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.metrics import registry
 
-# For SQLite, use different engine config
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+pool_checkouts = registry.counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool"
 )
+pool_wait_seconds = registry.counter(
+    "db_pool_checkout_wait_seconds_total",
+    "Time spent waiting for a pooled connection"
+)
+pool_timeouts = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT"
+)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    # Records how long callers wait for a connection (including opening a new
+    # one under max_overflow) and how often they time out.
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(engine=self.logging_name)
+            raise
+        finally:
+            pool_wait_seconds.inc(time.perf_counter() - start, engine=self.logging_name)
+        pool_checkouts.inc(engine=self.logging_name)
+        return connection
+
+# Engines whose pool gauges are read at scrape time, by name
+_pooled_engines = {}
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+    cursor.close()
+
+def build_engine(url: str, name: str = "primary") -> AsyncEngine:
+    is_sqlite = url.startswith("sqlite")
+    in_memory = is_sqlite and (":memory:" in url or url.rstrip("/").endswith("aiosqlite:"))
+
+    # SQL logging under DEBUG is enabled on the sqlalchemy.engine logger by
+    # setup_logging rather than through echo, so it goes through the queue
+    options = {
+        "future": True,
+        "connect_args": {"check_same_thread": False} if is_sqlite else {},
+    }
+    # In-memory SQLite keeps its single StaticPool connection
+    if not in_memory:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name=name,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    new_engine = create_async_engine(url, **options)
+    instrument_engine(new_engine)
+
+    if is_sqlite:
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+    if not in_memory:
+        _pooled_engines[name] = new_engine
+
+    return new_engine
+
+def _pool_samples(read):
+    return lambda: [
+        ({"engine": name}, read(pooled.pool)) for name, pooled in _pooled_engines.items()
+    ]
+
+registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    callback=_pool_samples(lambda pool: pool.checkedout())
+)
+registry.gauge(
+    "db_pool_size",
+    "Configured pool size",
+    callback=_pool_samples(lambda pool: pool.size())
+)
+registry.gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size",
+    callback=_pool_samples(lambda pool: max(0, pool.overflow()))
+)
+
+engine = build_engine(settings.DATABASE_URL)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -23,4 +117,4 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
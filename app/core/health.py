@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.sharding import shard_router
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+class HealthChecker:
+    # Readiness probes for the database engines and the shared cache. Probe
+    # results are reused for cache_seconds and concurrent checks share one
+    # probe, so a load balancer polling every worker adds no real DB load.
+    # Pool saturation is read live on every check since it is free.
+    def __init__(self, timeout: float, cache_seconds: float, saturation_threshold: float):
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self.saturation_threshold = saturation_threshold
+        self.engines: Dict[str, AsyncEngine] = {}
+        self.failures = 0
+        self._probes: Optional[Dict[str, Any]] = None
+        self._probed_at = 0.0
+        self._flights = SingleFlight()
+
+    def add_engine(self, name: str, probed_engine: AsyncEngine):
+        self.engines[name] = probed_engine
+
+    async def _timed_probe(self, probe) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"status": "error", "error": f"timed out after {self.timeout}s"}
+        except Exception as exc:
+            result = {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+        else:
+            result = {"status": "ok"}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    async def _probe_database(self, probed_engine: AsyncEngine):
+        async with probed_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _probe_cache(self) -> Dict[str, Any]:
+        if not cache.l2_enabled:
+            return {"status": "disabled"}
+
+        async def ping():
+            if not await cache.backend.ping():
+                raise ConnectionError("ping returned no reply")
+
+        return await self._timed_probe(ping)
+
+    async def _run_probes(self) -> Dict[str, Any]:
+        names = list(self.engines)
+        results = await asyncio.gather(
+            *(self._timed_probe(lambda e=self.engines[name]: self._probe_database(e)) for name in names),
+            self._probe_cache()
+        )
+        probes = {
+            "database": dict(zip(names, results[:-1])),
+            "cache": results[-1],
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if not self._probes_ok(probes):
+            self.failures += 1
+            logger.warning("Readiness probe failed: %s", probes)
+        return probes
+
+    @staticmethod
+    def _probes_ok(probes: Dict[str, Any]) -> bool:
+        return (
+            all(result["status"] == "ok" for result in probes["database"].values())
+            and probes["cache"]["status"] != "error"
+        )
+
+    async def probes(self) -> Dict[str, Any]:
+        if self._probes is not None and time.monotonic() - self._probed_at < self.cache_seconds:
+            return self._probes
+
+        probes = await self._flights.do("readiness", self._run_probes)
+        self._probes = probes
+        self._probed_at = time.monotonic()
+        return probes
+
+    def pool_saturation(self) -> Dict[str, Any]:
+        report = {}
+        for name, probed_engine in self.engines.items():
+            pool = probed_engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            # overflow() can go negative; capacity is the configured ceiling
+            capacity = pool.size() + max(0, pool._max_overflow)
+            checked_out = pool.checkedout()
+            saturation = checked_out / capacity if capacity else 0.0
+            report[name] = {
+                "checked_out": checked_out,
+                "capacity": capacity,
+                "saturation": round(saturation, 3),
+                "status": "saturated" if saturation >= self.saturation_threshold else "ok",
+            }
+        return report
+
+    async def readiness(self) -> Dict[str, Any]:
+        probes = await self.probes()
+        pools = self.pool_saturation()
+        ready = self._probes_ok(probes) and all(pool["status"] == "ok" for pool in pools.values())
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checked_at": probes["checked_at"],
+            "checks": {
+                "database": probes["database"],
+                "cache": probes["cache"],
+                "pool": pools,
+            },
+        }
+
+health_checker = HealthChecker(
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    cache_seconds=settings.HEALTH_CACHE_SECONDS,
+    saturation_threshold=settings.HEALTH_POOL_SATURATION_THRESHOLD
+)
+for shard_name, shard_engine in shard_router.engines.items():
+    health_checker.add_engine(shard_name, shard_engine)
+
+registry.counter(
+    "health_readiness_failures_total",
+    "Readiness probe rounds in which a dependency check failed",
+    callback=lambda: health_checker.failures
+)
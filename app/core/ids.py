@@ -0,0 +1,78 @@
+import asyncio
+from typing import Dict, List, Tuple
+from sqlalchemy import Table, select, insert, update, func
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import registry
+from app.core.sharding import shard_router
+from app.models.id_sequence import IdSequence
+
+# Ids of sharded tables are assigned by the application instead of each
+# shard's own autoincrement, which would hand out the same ids on every
+# shard and make moving a tenant impossible without renumbering rows that
+# appear in URLs and ETags. Every insert into such a table must take its ids
+# from id_allocator.
+
+id_blocks_reserved = registry.counter(
+    "id_blocks_reserved_total",
+    "Id blocks reserved from the primary, by table"
+)
+
+class IdAllocator:
+    # Each worker reserves blocks of block_size ids from the id_sequences row
+    # on the primary and hands them out locally, so a primary round trip is
+    # paid once per block. Ids still unused in a block when the worker stops
+    # are skipped, and ids are unique but only roughly increasing across
+    # workers.
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+        self._lock = asyncio.Lock()
+
+    async def allocate(self, table: Table, count: int = 1) -> List[int]:
+        # Call before the caller's session writes anything: on SQLite the
+        # primary may be the same database file
+        ids = []
+        async with self._lock:
+            while len(ids) < count:
+                next_id, end = self._blocks.get(table.name, (0, 0))
+                if next_id >= end:
+                    next_id, end = await self._reserve(table, max(self.block_size, count - len(ids)))
+                taken = min(end - next_id, count - len(ids))
+                ids.extend(range(next_id, next_id + taken))
+                self._blocks[table.name] = (next_id + taken, end)
+        return ids
+
+    async def _reserve(self, table: Table, size: int) -> Tuple[int, int]:
+        id_blocks_reserved.inc(table=table.name)
+        async with AsyncSessionLocal() as session:
+            end = await session.scalar(
+                update(IdSequence)
+                .where(IdSequence.name == table.name)
+                .values(next_id=IdSequence.next_id + size)
+                .returning(IdSequence.next_id)
+            )
+            if end is not None:
+                await session.commit()
+                return end - size, end
+
+            # First use: continue after the highest id on any shard
+            start = await self._highest_id(table) + 1
+            try:
+                await session.execute(insert(IdSequence).values(name=table.name, next_id=start + size))
+                await session.commit()
+            except IntegrityError:
+                # Another worker created the row first
+                await session.rollback()
+                return await self._reserve(table, size)
+        return start, start + size
+
+    async def _highest_id(self, table: Table) -> int:
+        highest = 0
+        for shard_engine in shard_router.engines.values():
+            async with shard_engine.connect() as conn:
+                highest = max(highest, await conn.scalar(select(func.max(table.c.id))) or 0)
+        return highest
+
+id_allocator = IdAllocator(block_size=settings.ID_BLOCK_SIZE)
@@ -0,0 +1,157 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.metrics import registry
+
+# Per-request timing: an ASGI middleware opens a RequestStats for every HTTP
+# request, and the SQLAlchemy / cache hooks below add to whichever one is
+# active in the current context.
+
+@dataclass
+class RequestStats:
+    start: float = field(default_factory=time.perf_counter)
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    compress_seconds: float = 0.0
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response is fully sent"
+)
+request_db_seconds = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per request"
+)
+request_db_statements = registry.histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+request_serialize_seconds = registry.histogram(
+    "http_request_serialize_seconds",
+    "Time spent rendering response bodies per request"
+)
+statement_duration = registry.histogram(
+    "db_statement_duration_seconds",
+    "Duration of individual SQL statements"
+)
+cache_lookups = registry.counter(
+    "http_request_cache_lookups_total",
+    "Cache lookups made while serving requests, by route and result"
+)
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+def record_cache_lookup(hit: bool):
+    stats = _current.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+def record_cache_time(seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.cache_seconds += seconds
+
+def record_compression_time(seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.compress_seconds += seconds
+
+@contextmanager
+def timed_serialization():
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - start
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    statement_duration.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.db_statements += 1
+        stats.db_seconds += elapsed
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+def instrument_engine(engine: AsyncEngine):
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+def _server_timing(stats: RequestStats) -> str:
+    total = (time.perf_counter() - stats.start) * 1000
+    return ", ".join([
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.db_statements} queries"',
+        f'cache;dur={stats.cache_seconds * 1000:.2f};desc="{stats.cache_hits} hit, {stats.cache_misses} miss"',
+        f"serialize;dur={stats.serialize_seconds * 1000:.2f}",
+        f"compress;dur={stats.compress_seconds * 1000:.2f}",
+        f"total;dur={total:.2f}",
+    ])
+
+class TimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # Label by route template, never the raw path, to bound cardinality
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            request_duration.observe(
+                time.perf_counter() - stats.start,
+                method=scope["method"],
+                route=route_path,
+                status=status_code
+            )
+            request_db_seconds.observe(stats.db_seconds, route=route_path)
+            request_db_statements.observe(stats.db_statements, route=route_path)
+            request_serialize_seconds.observe(stats.serialize_seconds, route=route_path)
+            if stats.cache_hits:
+                cache_lookups.inc(stats.cache_hits, route=route_path, result="hit")
+            if stats.cache_misses:
+                cache_lookups.inc(stats.cache_misses, route=route_path, result="miss")
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from sqlalchemy import update, bindparam
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import registry
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+class LastLoginBuffer:
+    # Write-behind buffer for users.last_login. Logins only record the time in
+    # memory; a background task flushes the latest time per user in one
+    # executemany UPDATE every flush_interval seconds (sooner when full).
+    def __init__(self, max_pending: int, flush_interval: float):
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.flushed = 0
+        self.dropped = 0
+        self._pending: Dict[int, datetime] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, user_id: int):
+        if user_id not in self._pending and len(self._pending) >= self.max_pending:
+            # Full: drop rather than grow, and make sure a flush is on its way
+            self.dropped += 1
+            self._wake()
+            return
+
+        self._pending[user_id] = datetime.now(timezone.utc)
+        if len(self._pending) >= self.max_pending:
+            self._wake()
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        users = User.__table__
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(users)
+                    .where(users.c.id == bindparam("b_id"))
+                    .values(last_login=bindparam("b_last_login")),
+                    [
+                        {"b_id": user_id, "b_last_login": logged_in_at}
+                        for user_id, logged_in_at in batch.items()
+                    ]
+                )
+                await session.commit()
+        except BaseException:
+            # Put the batch back for the next attempt unless newer logins
+            # for the same users arrived in the meantime. Also on
+            # cancellation: stop() cancels a flush in progress and then
+            # flushes again, and the UPDATE is idempotent.
+            for user_id, logged_in_at in batch.items():
+                self._pending.setdefault(user_id, logged_in_at)
+            raise
+
+        self.flushed += len(batch)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush %s last_login updates", len(self._pending))
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+last_login_buffer = LastLoginBuffer(
+    max_pending=settings.LAST_LOGIN_MAX_PENDING,
+    flush_interval=settings.LAST_LOGIN_FLUSH_INTERVAL_SECONDS
+)
+
+registry.gauge(
+    "last_login_pending",
+    "Users whose last_login update is waiting to be flushed",
+    callback=lambda: len(last_login_buffer)
+)
+registry.counter(
+    "last_login_flushed_total",
+    "last_login updates written to the database",
+    callback=lambda: last_login_buffer.flushed
+)
+registry.counter(
+    "last_login_dropped_total",
+    "last_login updates dropped because the buffer was full",
+    callback=lambda: last_login_buffer.dropped
+)
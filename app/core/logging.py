@@ -1,31 +1,218 @@
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
 import os
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import registry
+
+# Request-scoped fields stamped onto every record logged while serving a request
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+organization_id_var: ContextVar[Optional[int]] = ContextVar("organization_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "request_id", "organization_id"
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_dropped = {"queue_full": 0, "sampled": 0}
+
+class ContextFilter(logging.Filter):
+    # Runs on the emitting side, where the request context is still visible
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.organization_id = organization_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    # Keeps only a fraction of DEBUG records and of the SQL echo that
+    # sqlalchemy.engine emits at INFO; warnings and errors always pass.
+    def __init__(self, debug_rate: float, sql_rate: float):
+        super().__init__()
+        self.debug_rate = debug_rate
+        self.sql_rate = sql_rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        if record.name.startswith("sqlalchemy.engine"):
+            rate = self.sql_rate
+        elif record.levelno <= logging.DEBUG:
+            rate = self.debug_rate
+        else:
+            return True
+        if rate >= 1 or random.random() < rate:
+            return True
+        _dropped["sampled"] += 1
+        return False
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Render the message and traceback here, while args and exc_info are
+        # still live, but keep the record's fields for the JSON formatter
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        prepared = logging.makeLogRecord(record.__dict__)
+        prepared.msg = message
+        prepared.message = message
+        prepared.args = None
+        prepared.exc_info = None
+        return prepared
+
+    def enqueue(self, record):
+        # Never block the event loop on a full queue; drop and count instead
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped["queue_full"] += 1
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "organization_id": getattr(record, "organization_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+def _build_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s'
+    )
+
+def _build_file_handler(log_file: str) -> logging.Handler:
+    if settings.LOG_ROTATE_WHEN:
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file,
+            when=settings.LOG_ROTATE_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            utc=True
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT
+    )
 
 def setup_logging():
+    global _listener
+
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    
+    if _listener is not None:
+        return logger
+
+    level = logging.getLevelName(settings.LOG_LEVEL.upper())
+    logger.setLevel(level)
+
     # Create logs directory if it doesn't exist
-    logs_dir = "logs"
-    if not os.path.exists(logs_dir):
+    log_file = settings.LOG_FILE
+    logs_dir = os.path.dirname(log_file)
+    if logs_dir and not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
-    
-    # Console handler
+
+    formatter = _build_formatter()
+
+    # Console and file output happen on the listener's thread
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    console_handler.setLevel(level)
+    console_handler.setFormatter(formatter)
+
+    file_handler = _build_file_handler(log_file)
+    file_handler.setLevel(level)
+    file_handler.setFormatter(formatter)
+
+    # The only handler on the root logger just enqueues the record
+    queue_handler = NonBlockingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(SamplingFilter(
+        debug_rate=settings.LOG_DEBUG_SAMPLE_RATE,
+        sql_rate=settings.LOG_SQL_SAMPLE_RATE
+    ))
+    logger.addHandler(queue_handler)
+
+    # SQL echo goes through the same pipeline instead of engine echo's own
+    # synchronous stdout handler
+    if settings.DEBUG:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+    _listener = logging.handlers.QueueListener(
+        queue_handler.queue, console_handler, file_handler, respect_handler_level=True
     )
-    console_handler.setFormatter(console_format)
-    
-    # File handler (simplified - no rotation for now)
-    log_file = os.path.join(logs_dir, 'app.log')
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(console_format)
-    
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    return logger
\ No newline at end of file
+    _listener.start()
+
+    return logger
+
+def stop_logging():
+    # Drains whatever is still queued and closes the handlers
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+class RequestContextMiddleware:
+    # Assigns each HTTP request an id (reusing a sane incoming X-Request-ID)
+    # and echoes it on the response
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if 0 < len(candidate) <= 128 and candidate.isprintable():
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        request_token = request_id_var.set(request_id)
+        organization_token = organization_id_var.set(None)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            organization_id_var.reset(organization_token)
+            request_id_var.reset(request_token)
+
+registry.gauge(
+    "log_queue_depth",
+    "Log records waiting for the listener thread",
+    callback=lambda: _listener.queue.qsize() if _listener is not None else 0
+)
+registry.counter(
+    "log_records_dropped_total",
+    "Log records dropped before reaching a handler, by reason",
+    callback=lambda: [({"reason": reason}, count) for reason, count in _dropped.items()]
+)
@@ -0,0 +1,147 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# Minimal in-process metrics registry rendered in Prometheus text format.
+
+LabelSet = Tuple[Tuple[str, str], ...]
+Sample = Tuple[dict, float]
+Callback = Callable[[], Union[float, Iterable[Sample]]]
+
+def _label_set(labels: dict) -> LabelSet:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, callback: Optional[Callback] = None):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self._values: Dict[LabelSet, float] = {}
+        self._lock = threading.Lock()
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_set(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelSet, float]]:
+        if self.callback is not None:
+            result = self.callback()
+            if isinstance(result, (int, float)):
+                return [(self.name, (), float(result))]
+            return [(self.name, _label_set(labels), float(value)) for labels, value in result]
+
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in self._values.items()]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_set(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_set(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_set(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+        # label set -> (per-bucket counts, sum, count)
+        self._series: Dict[LabelSet, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_set(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> List[Tuple[str, LabelSet, float]]:
+        samples = []
+        with self._lock:
+            for labels, (counts, total, count) in self._series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    samples.append((f"{self.name}_bucket", labels + (("le", repr(bound)),), cumulative))
+                samples.append((f"{self.name}_bucket", labels + (("le", "+Inf"),), count))
+                samples.append((f"{self.name}_sum", labels, total))
+                samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, callback: Optional[Callback] = None) -> Counter:
+        return self._register(Counter, name, documentation, callback=callback)
+
+    def gauge(self, name: str, documentation: str, callback: Optional[Callback] = None) -> Gauge:
+        return self._register(Gauge, name, documentation, callback=callback)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
@@ -0,0 +1,75 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.metrics import registry
+
+T = TypeVar("T")
+
+class PasswordHashPool:
+    # Runs bcrypt off the event loop on a dedicated thread pool (bcrypt
+    # releases the GIL while hashing). Calls beyond max_pending are rejected
+    # with 503 instead of queueing without bound, so a login storm only
+    # degrades login latency.
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests",
+                headers={"Retry-After": "1"}
+            )
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(fn, *args))
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+registry.gauge(
+    "password_hash_in_flight",
+    "Password hash/verify calls admitted to the worker pool",
+    callback=lambda: password_pool.in_flight
+)
+registry.gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify calls waiting for a free worker",
+    callback=lambda: password_pool.queued
+)
+registry.counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls rejected by the admission limit",
+    callback=lambda: password_pool.rejected
+)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import event
+from app.core.config import settings
+from app.core.lru import TTLCache
+from app.core.metrics import registry
+from app.models.user import User, UserRole
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    # Detached snapshot of the authenticated user; safe to share across
+    # requests and sessions, unlike an ORM instance.
+    id: int
+    email: str
+    full_name: str
+    role: UserRole
+    organization_id: int
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            organization_id=user.organization_id,
+            is_active=user.is_active,
+            created_at=user.created_at
+        )
+
+class PrincipalCache:
+    # Per-process cache of principals keyed by user id. Entries live at most
+    # PRINCIPAL_CACHE_TTL_SECONDS, which bounds how long other workers may keep
+    # serving a user after it is deactivated or its role changes here.
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        return self._cache.get(user_id)
+
+    def set(self, principal: Principal):
+        self._cache.set(principal.id, principal)
+
+    def invalidate(self, user_id: int):
+        self._cache.pop(user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+def invalidate_principal(user_id: int):
+    principal_cache.invalidate(user_id)
+
+# Drop the snapshot whenever a User row is changed or deleted through the ORM
+# (deactivation, role changes). Core-level bulk UPDATEs must call
+# invalidate_principal() themselves.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    invalidate_principal(target.id)
+
+registry.counter(
+    "principal_cache_hits_total",
+    "Authenticated principal lookups served from the in-process cache",
+    callback=lambda: principal_cache.hits
+)
+registry.counter(
+    "principal_cache_misses_total",
+    "Authenticated principal lookups that went to the database",
+    callback=lambda: principal_cache.misses
+)
+registry.gauge(
+    "principal_cache_entries",
+    "Principals currently held in the in-process cache",
+    callback=lambda: len(principal_cache)
+)
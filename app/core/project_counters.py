@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import select, func, union
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import registry
+from app.core.sharding import shard_router
+from app.models.project import Project, ProjectCounter, ProjectStatus
+
+logger = logging.getLogger(__name__)
+
+# Per-organization, per-status project counts (the project_counters table).
+# Every project write path calls adjust_project_counts before committing, so
+# a count changes atomically with the rows it counts and totals are a
+# primary-key read instead of a COUNT(*) over the tenant's projects. Writes
+# that bypass the API (manual SQL, restores) are repaired by
+# reconcile_project_counts, run from the command line, once or (--loop) as
+# the single periodic reconciler of a deployment.
+
+counter_repairs = registry.counter(
+    "project_counter_repairs_total",
+    "Project counter rows corrected by reconciliation, by shard"
+)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def _upsert(db: AsyncSession, rows: list, increment: bool):
+    dialect = db.get_bind().dialect.name
+    if dialect not in _INSERTS:
+        raise NotImplementedError(f"Project counters are not supported on {dialect}")
+    stmt = _INSERTS[dialect](ProjectCounter).values(rows)
+    count = ProjectCounter.count + stmt.excluded.count if increment else stmt.excluded.count
+    return stmt.on_conflict_do_update(
+        index_elements=[ProjectCounter.organization_id, ProjectCounter.status],
+        set_={"count": count}
+    )
+
+async def adjust_project_counts(db: AsyncSession, organization_id: int, deltas: Dict[ProjectStatus, int]):
+    # One upsert for every status that changed, inside the caller's
+    # transaction. Rows are written in a fixed order so concurrent writers of
+    # the same tenant lock them in the same order and cannot deadlock.
+    rows = [
+        {"organization_id": organization_id, "status": project_status, "count": delta}
+        for project_status, delta in sorted(deltas.items(), key=lambda item: item[0].value)
+        if project_status is not None and delta
+    ]
+    if rows:
+        await db.execute(_upsert(db, rows, increment=True))
+
+async def project_counts(db: AsyncSession, organization_id: int) -> Dict[ProjectStatus, int]:
+    counts = {project_status: 0 for project_status in ProjectStatus}
+    counts.update((await db.execute(
+        select(ProjectCounter.status, ProjectCounter.count)
+        .where(ProjectCounter.organization_id == organization_id)
+    )).all())
+    return counts
+
+async def reconcile_project_counts(db: AsyncSession, organization_id: int) -> int:
+    # Recounts one tenant's projects and overwrites the counter rows that
+    # disagree, without committing. The tenant's counter rows are locked
+    # before counting, so on Postgres its writers that reach them during the
+    # repair wait for it and apply their change on top; other tenants are
+    # not held up. Returns the number of rows repaired.
+    stored = dict((await db.execute(
+        select(ProjectCounter.status, ProjectCounter.count)
+        .where(ProjectCounter.organization_id == organization_id)
+        .with_for_update()
+    )).all())
+    actual = dict((await db.execute(
+        select(Project.status, func.count())
+        .where(Project.organization_id == organization_id, Project.status.is_not(None))
+        .group_by(Project.status)
+    )).all())
+
+    repairs = [
+        {"organization_id": organization_id, "status": project_status, "count": actual.get(project_status, 0)}
+        for project_status in sorted(stored.keys() | actual.keys(), key=lambda key: key.value)
+        if stored.get(project_status, 0) != actual.get(project_status, 0)
+    ]
+    if repairs:
+        await db.execute(_upsert(db, repairs, increment=False))
+    return len(repairs)
+
+async def _organization_ids(db: AsyncSession) -> List[int]:
+    # Tenants with projects or counter rows on the session's shard
+    rows = await db.scalars(union(
+        select(Project.organization_id),
+        select(ProjectCounter.organization_id)
+    ))
+    return sorted(rows.all())
+
+async def reconcile_all(organization_id: Optional[int] = None) -> int:
+    # One transaction per tenant, so each holds only that tenant's locks
+    repaired = 0
+    for name, sessionmaker in shard_router.sessionmakers.items():
+        async with sessionmaker() as session:
+            organization_ids = [organization_id] if organization_id is not None else await _organization_ids(session)
+            await session.commit()
+            count = 0
+            for org in organization_ids:
+                count += await reconcile_project_counts(session, org)
+                await session.commit()
+        if count:
+            counter_repairs.inc(count, shard=name)
+            logger.warning("Repaired %s project counter rows on shard %s", count, name)
+        repaired += count
+    return repaired
+
+async def _main(args):
+    try:
+        while True:
+            try:
+                repaired = await reconcile_all(args.org)
+                print(f"Repaired {repaired} project counter rows")
+            except Exception:
+                if not args.loop:
+                    raise
+                logger.exception("Project counter reconciliation failed")
+            if not args.loop:
+                break
+            await asyncio.sleep(settings.PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS)
+    finally:
+        await shard_router.dispose()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recount projects and repair project_counters")
+    parser.add_argument("--org", type=int, help="only this organization (default: all)")
+    parser.add_argument(
+        "--loop",
+        action="store_true",
+        help="repeat every PROJECT_COUNTER_RECONCILE_INTERVAL_SECONDS; run one such process per deployment"
+    )
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
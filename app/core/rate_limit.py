@@ -0,0 +1,243 @@
+import itertools
+import logging
+import math
+import time
+import uuid
+from typing import Dict, Optional
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.lru import TTLCache
+from app.core.metrics import registry
+from app.core.redis_client import redis_client
+from app.core.security import decode_token
+
+logger = logging.getLogger(__name__)
+
+# Per-organization fairness controls: a token bucket on request rate plus a
+# cap on requests in flight, keyed on the `org` claim of the bearer token.
+# Bulk, import and export calls draw RATE_LIMIT_BULK_COST tokens.
+
+_HEAVY_ENDPOINTS = {"bulk", "import", "export"}
+
+rate_limit_decisions = registry.counter(
+    "rate_limit_requests_total",
+    "Authenticated requests by organization and limiter decision"
+)
+rate_limit_errors = registry.counter(
+    "rate_limit_backend_errors_total",
+    "Shared limiter calls that failed and were let through"
+)
+
+class LocalRateLimiter:
+    # Single-worker implementation. A bucket idle long enough to refill
+    # completely is indistinguishable from a new one, so buckets live in a
+    # TTLCache that forgets them after that long.
+    def __init__(self, rate: float, burst: int, max_concurrent: int, max_tenants: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._buckets = TTLCache(maxsize=max_tenants, ttl=burst / rate + 1)
+        self._in_flight: Dict[int, int] = {}
+        self._slots = itertools.count(1)
+
+    async def acquire(self, organization_id: int, cost: int = 1) -> float:
+        # Returns 0 when admitted, otherwise seconds until cost tokens exist
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(organization_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / self.rate
+        self._buckets.set(organization_id, (tokens, now))
+        return retry_after
+
+    async def enter(self, organization_id: int) -> Optional[str]:
+        # Returns the slot to pass to leave, or None when the cap is reached
+        current = self._in_flight.get(organization_id, 0)
+        if current >= self.max_concurrent:
+            return None
+        self._in_flight[organization_id] = current + 1
+        return str(next(self._slots))
+
+    async def leave(self, organization_id: int, slot: str):
+        current = self._in_flight.get(organization_id, 0) - 1
+        if current > 0:
+            self._in_flight[organization_id] = current
+        else:
+            self._in_flight.pop(organization_id, None)
+
+    def in_flight(self) -> Dict[int, int]:
+        return dict(self._in_flight)
+
+# KEYS[1] bucket hash; ARGV rate, burst, now, cost. Returns the wait in
+# seconds as a string (Lua numbers are truncated to integers in replies).
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+# KEYS[1] sorted set of in-flight request slots scored by their deadline;
+# ARGV limit, now, ttl, slot. Each request holds its own entry, so a slot
+# leaked by a worker that died mid-request expires on its own after ttl
+# seconds without affecting the others.
+_ENTER_SCRIPT = """
+local now = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + ttl, ARGV[4])
+redis.call('EXPIRE', KEYS[1], math.ceil(ttl))
+return 1
+"""
+
+class RedisRateLimiter:
+    # Multi-worker implementation sharing state through RedisClient. Each
+    # check is one atomic script call. If Redis fails the request is let
+    # through rather than turning a cache outage into an API outage.
+    def __init__(self, rate: float, burst: int, max_concurrent: int, slot_ttl: int = 300):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.slot_ttl = slot_ttl
+
+    async def acquire(self, organization_id: int, cost: int = 1) -> float:
+        try:
+            retry_after = await redis_client.eval(
+                _TOKEN_BUCKET_SCRIPT,
+                [f"ratelimit:org:{organization_id}:bucket"],
+                self.rate, self.burst, time.time(), cost
+            )
+        except Exception:
+            rate_limit_errors.inc()
+            logger.warning("Rate limit check failed for org %s", organization_id, exc_info=True)
+            return 0.0
+        return float(retry_after)
+
+    async def enter(self, organization_id: int) -> Optional[str]:
+        slot = uuid.uuid4().hex
+        try:
+            admitted = await redis_client.eval(
+                _ENTER_SCRIPT,
+                [f"ratelimit:org:{organization_id}:in_flight"],
+                self.max_concurrent, time.time(), self.slot_ttl, slot
+            )
+        except Exception:
+            rate_limit_errors.inc()
+            logger.warning("Concurrency check failed for org %s", organization_id, exc_info=True)
+            return slot
+        return slot if admitted else None
+
+    async def leave(self, organization_id: int, slot: str):
+        try:
+            await redis_client.zrem(f"ratelimit:org:{organization_id}:in_flight", slot)
+        except Exception:
+            rate_limit_errors.inc()
+            logger.warning("Concurrency release failed for org %s", organization_id, exc_info=True)
+
+local_limiter = LocalRateLimiter(
+    rate=settings.RATE_LIMIT_REQUESTS_PER_SECOND,
+    burst=settings.RATE_LIMIT_BURST,
+    max_concurrent=settings.RATE_LIMIT_MAX_CONCURRENT
+)
+redis_limiter = RedisRateLimiter(
+    rate=settings.RATE_LIMIT_REQUESTS_PER_SECOND,
+    burst=settings.RATE_LIMIT_BURST,
+    max_concurrent=settings.RATE_LIMIT_MAX_CONCURRENT
+)
+
+def get_limiter():
+    # Redis connects during startup, so the choice is made per request
+    if settings.RATE_LIMIT_BACKEND == "redis" and redis_client.enabled:
+        return redis_limiter
+    return local_limiter
+
+def _organization_id(scope) -> Optional[int]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return decode_token(token).organization_id
+            except HTTPException:
+                # Let the endpoint's own auth dependency reject it
+                return None
+    return None
+
+def _request_cost(path: str) -> int:
+    if path.rstrip("/").rsplit("/", 1)[-1] in _HEAVY_ENDPOINTS:
+        return min(settings.RATE_LIMIT_BULK_COST, settings.RATE_LIMIT_BURST)
+    return 1
+
+def _too_many_requests(detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=429,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+class RateLimitMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        organization_id = _organization_id(scope)
+        if organization_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = get_limiter()
+        retry_after = await limiter.acquire(organization_id, _request_cost(scope["path"]))
+        if retry_after > 0:
+            rate_limit_decisions.inc(organization=organization_id, result="rate_limited")
+            response = _too_many_requests("Rate limit exceeded for organization", retry_after)
+            await response(scope, receive, send)
+            return
+
+        slot = await limiter.enter(organization_id)
+        if slot is None:
+            rate_limit_decisions.inc(organization=organization_id, result="concurrency_limited")
+            response = _too_many_requests("Too many concurrent requests for organization", 1)
+            await response(scope, receive, send)
+            return
+
+        rate_limit_decisions.inc(organization=organization_id, result="allowed")
+        try:
+            # The slot is held until the response body is fully sent, which
+            # covers streamed exports
+            await self.app(scope, receive, send)
+        finally:
+            await limiter.leave(organization_id, slot)
+
+registry.gauge(
+    "rate_limit_in_flight",
+    "Requests currently admitted per organization (this worker)",
+    callback=lambda: [
+        ({"organization": organization_id}, count)
+        for organization_id, count in local_limiter.in_flight().items()
+    ]
+)
@@ -1,6 +1,20 @@
 import redis.asyncio as redis
 from app.core.config import settings
+from app.core.instrumentation import record_cache_time
+from functools import wraps
 import json
+import time
+
+def _timed(method):
+    # Attributes the time spent waiting on Redis to the current request
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            record_cache_time(time.perf_counter() - start)
+    return wrapper
 
 class RedisClient:
     def __init__(self):
@@ -9,12 +23,17 @@ class RedisClient:
     
     async def connect(self):
         if self.redis_url:
-            self.client = redis.from_url(self.redis_url, decode_responses=True)
+            self.client = redis.from_url(self.redis_url, decode_responses=False)
     
     async def disconnect(self):
         if self.client:
             await self.client.close()
     
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+    
+    @_timed
     async def get(self, key: str):
         if self.client:
             value = await self.client.get(key)
@@ -22,12 +41,46 @@ class RedisClient:
                 return json.loads(value)
         return None
     
+    @_timed
     async def set(self, key: str, value, expire: int = 300):
         if self.client:
             await self.client.setex(key, expire, json.dumps(value))
     
+    @_timed
+    async def get_raw(self, key: str):
+        if self.client:
+            return await self.client.get(key)
+        return None
+    
+    @_timed
+    async def set_raw(self, key: str, value, expire: int = 300):
+        if self.client:
+            await self.client.setex(key, expire, value)
+    
+    @_timed
     async def delete(self, key: str):
         if self.client:
             await self.client.delete(key)
+    
+    @_timed
+    async def incr(self, key: str):
+        if self.client:
+            return await self.client.incr(key)
+        return None
+    
+    async def zrem(self, key: str, *members):
+        if self.client:
+            return await self.client.zrem(key, *members)
+        return None
+    
+    async def eval(self, script: str, keys: list, *args):
+        if self.client:
+            return await self.client.eval(script, len(keys), *keys, *args)
+        return None
+    
+    async def ping(self) -> bool:
+        if self.client:
+            return await self.client.ping()
+        return False
 
 redis_client = RedisClient()
\ No newline at end of file
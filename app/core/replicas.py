@@ -0,0 +1,180 @@
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import build_engine
+from app.core.metrics import registry
+from app.core.sharding import shard_router
+
+logger = logging.getLogger(__name__)
+
+replica_reads = registry.counter(
+    "db_replica_reads_total",
+    "Read sessions handed out, by shard, serving engine and reason"
+)
+
+class Replica:
+    def __init__(self, name: str, replica_engine: AsyncEngine):
+        self.name = name
+        self.engine = replica_engine
+        self.sessionmaker = async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+
+    def in_use(self) -> int:
+        pool = self.engine.pool
+        return pool.checkedout() if hasattr(pool, "checkedout") else 0
+
+class ReplicaRouter:
+    # Hands read-only handlers a session on one of their shard's replicas.
+    # Reads for an organization go to the shard's primary instead for
+    # sticky_seconds after it was written to (read-your-writes), and whenever
+    # no replica of the shard is healthy. The recent writes are kept in the
+    # cache: shared between workers with an L2 backend, per process without
+    # one, where a read served by another worker than the write can still
+    # reach a lagging replica. Health is probed in the background and a replica is
+    # also taken out as soon as a request hits a connection error on it.
+    def __init__(self, replica_urls: List[tuple], strategy: str, sticky_seconds: float, check_interval: float):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown READ_REPLICA_STRATEGY {strategy!r}")
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.check_interval = check_interval
+        self.replicas: Dict[str, List[Replica]] = {}
+        for shard, url in replica_urls:
+            if shard not in shard_router.engines:
+                raise ValueError(f"Replica configured for unknown shard {shard!r}")
+            replicas = self.replicas.setdefault(shard, [])
+            name = f"{shard}-replica{len(replicas) + 1}"
+            replicas.append(Replica(name, build_engine(url, name=name)))
+        self._turns = {shard: itertools.count() for shard in self.replicas}
+        self._task: Optional[asyncio.Task] = None
+
+    def _choose(self, shard: str) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas.get(shard, ()) if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_connections":
+            return min(healthy, key=Replica.in_use)
+        return healthy[next(self._turns[shard]) % len(healthy)]
+
+    @staticmethod
+    def _sticky_key(organization_id: int) -> str:
+        return f"replica:recent_write:org:{organization_id}"
+
+    async def mark_write(self, organization_id: int):
+        if self.replicas:
+            await cache.set(self._sticky_key(organization_id), 1, expire=max(1, round(self.sticky_seconds)))
+
+    async def _recently_written(self, organization_id: int) -> bool:
+        return await cache.get(self._sticky_key(organization_id)) is not None
+
+    @asynccontextmanager
+    async def session(self, shard: str, organization_id: int):
+        replica = None
+        if shard in self.replicas:
+            if await self._recently_written(organization_id):
+                reason = "recent_write"
+            else:
+                replica = self._choose(shard)
+                reason = "replica" if replica else "no_healthy_replica"
+        else:
+            reason = "no_replicas"
+
+        if replica is None:
+            replica_reads.inc(shard=shard, engine=shard, reason=reason)
+            async with shard_router.sessionmakers[shard]() as session:
+                yield session
+            return
+
+        replica_reads.inc(shard=shard, engine=replica.name, reason=reason)
+        async with replica.sessionmaker() as session:
+            try:
+                yield session
+            except DBAPIError as exc:
+                if exc.connection_invalidated or isinstance(exc.orig, (OSError, ConnectionError)):
+                    self._mark_down(replica, exc)
+                raise
+
+    def _mark_down(self, replica: Replica, reason):
+        if replica.healthy:
+            logger.warning("Read replica %s marked unhealthy: %s", replica.name, reason)
+        replica.healthy = False
+
+    async def check(self):
+        for replicas in self.replicas.values():
+            for replica in replicas:
+                try:
+                    async with replica.engine.connect() as conn:
+                        await asyncio.wait_for(
+                            conn.execute(text("SELECT 1")),
+                            timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+                        )
+                except Exception as exc:
+                    self._mark_down(replica, exc)
+                else:
+                    if not replica.healthy:
+                        logger.info("Read replica %s is healthy again", replica.name)
+                    replica.healthy = True
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await asyncio.wait_for(self.check(), timeout=self.check_interval * 2)
+            except Exception:
+                logger.exception("Read replica health check failed")
+
+    def start(self):
+        if self.replicas and not cache.l2_enabled:
+            logger.warning(
+                "Read replicas are configured without a shared cache backend; "
+                "read-your-writes only holds within each worker"
+            )
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replicas in self.replicas.values():
+            for replica in replicas:
+                await replica.engine.dispose()
+
+def _parse_replica_urls(value: str) -> List[tuple]:
+    # "primary=sqlite+aiosqlite:///./replica1.db,primary=...,east=..."; a
+    # shard name may repeat, once per replica
+    replicas = []
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        shard, _, url = entry.partition("=")
+        if not shard or not url:
+            raise ValueError(f"READ_REPLICA_URLS entry must be shard=url, got {entry!r}")
+        replicas.append((shard.strip(), url.strip()))
+    return replicas
+
+replica_router = ReplicaRouter(
+    replica_urls=_parse_replica_urls(settings.READ_REPLICA_URLS),
+    strategy=settings.READ_REPLICA_STRATEGY,
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    check_interval=settings.READ_REPLICA_CHECK_INTERVAL_SECONDS
+)
+
+registry.gauge(
+    "db_replica_healthy",
+    "Whether a read replica is currently used (1) or bypassed (0)",
+    callback=lambda: [
+        ({"shard": shard, "engine": replica.name}, int(replica.healthy))
+        for shard, replicas in replica_router.replicas.items()
+        for replica in replicas
+    ]
+)
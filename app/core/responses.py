@@ -0,0 +1,27 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.core.instrumentation import timed_serialization
+
+# App-wide default response class. For handlers with a response_model,
+# FastAPI hands render() data pydantic has already reduced to JSON types, and
+# orjson writes it several times faster than json.dumps with the same bytes
+# (compact, UTF-8). Data passed in directly keeps working too: datetimes are
+# written as RFC 3339 (UTC as "Z", like pydantic), str enums such as
+# ProjectStatus and UserRole by value, also as dict keys, and models through
+# their JSON dump.
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        with timed_serialization():
+            return orjson.dumps(
+                content,
+                default=_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+            )
@@ -0,0 +1,155 @@
+import re
+from typing import Optional
+from sqlalchemy import select, inspect, text, func, literal_column, or_, column, table
+from sqlalchemy.sql import Select
+from app.models.project import Project, ProjectStatus
+
+# Full-text index over projects.name/description, kept in sync by the
+# database itself so every write path (single, bulk, import, shard moves) is
+# covered:
+# - SQLite: FTS5 external-content table projects_fts plus triggers; the text
+#   is stored once, in projects.
+# - Postgres: expression GIN index on a tsvector of the same columns.
+# Other backends fall back to a LIKE scan.
+
+FTS_TABLE = "projects_fts"
+
+_SQLITE_TABLE_DDL = f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description, organization_id,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )"""
+
+# An external-content 'delete' must repeat every old column value, or the
+# index is corrupted
+_SQLITE_TRIGGERS = {
+    "projects_fts_insert": f"""CREATE TRIGGER projects_fts_insert AFTER INSERT ON projects BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description, organization_id)
+        VALUES (new.id, new.name, new.description, new.organization_id);
+    END""",
+    "projects_fts_delete": f"""CREATE TRIGGER projects_fts_delete AFTER DELETE ON projects BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, organization_id)
+        VALUES ('delete', old.id, old.name, old.description, old.organization_id);
+    END""",
+    "projects_fts_update": f"""CREATE TRIGGER projects_fts_update AFTER UPDATE OF name, description, organization_id ON projects BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, organization_id)
+        VALUES ('delete', old.id, old.name, old.description, old.organization_id);
+        INSERT INTO {FTS_TABLE}(rowid, name, description, organization_id)
+        VALUES (new.id, new.name, new.description, new.organization_id);
+    END""",
+}
+
+# Indexes whatever rows the table already holds
+_SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+# Full setup, in order; also run by the projects_search migration
+SQLITE_DDL = [_SQLITE_TABLE_DDL, *_SQLITE_TRIGGERS.values(), _SQLITE_REBUILD]
+
+# The query below must repeat this expression verbatim to use the index
+_POSTGRES_DOCUMENT = (
+    "to_tsvector('simple', coalesce(projects.name, '') || ' ' || coalesce(projects.description, ''))"
+)
+POSTGRES_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_projects_search ON projects USING gin ("
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')))",
+]
+
+def _normalized(sql: str) -> str:
+    return " ".join(sql.split())
+
+def ensure_search_index(connection):
+    # Sync; run through run_sync on a connection of each shard
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        if not inspect(connection).has_table(FTS_TABLE):
+            for statement in SQLITE_DDL:
+                connection.execute(text(statement))
+            return
+        # Replace triggers that differ from the current definitions (older
+        # databases may have a broken one) and reindex if any did
+        existing = dict(connection.execute(text(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'projects'"
+        )).all())
+        stale = [
+            name for name, statement in _SQLITE_TRIGGERS.items()
+            if _normalized(existing.get(name) or "") != _normalized(statement)
+        ]
+        for name in stale:
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            connection.execute(text(_SQLITE_TRIGGERS[name]))
+        if stale:
+            connection.execute(text(_SQLITE_REBUILD))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+def _fts5_query(q: str, organization_id: int) -> Optional[str]:
+    # User input is reduced to quoted terms, so FTS5 operators and syntax
+    # errors cannot be injected; all terms must match name or description and
+    # the last one also matches as a prefix (search-as-you-type). The tenant
+    # is part of the MATCH so only its rows are ever ranked.
+    tokens = _TOKEN.findall(q)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return f'organization_id : "{organization_id}" AND {{name description}} : ({" ".join(terms)})'
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def like_search_query(organization_id: int, q: str, status: Optional[ProjectStatus] = None) -> Select:
+    # Unindexed scan of the tenant's rows; the fallback, and the benchmark baseline
+    pattern = _like_pattern(q)
+    query = select(Project).where(
+        Project.organization_id == organization_id,
+        or_(
+            Project.name.ilike(pattern, escape="\\"),
+            Project.description.ilike(pattern, escape="\\")
+        )
+    )
+    if status:
+        query = query.where(Project.status == status)
+    return query.order_by(Project.created_at.desc(), Project.id.desc())
+
+def search_query(
+    dialect: str,
+    organization_id: int,
+    q: str,
+    status: Optional[ProjectStatus] = None
+) -> Optional[Select]:
+    # Best match first, newest first among ties. None when q has nothing to
+    # search for.
+    if dialect == "sqlite":
+        match = _fts5_query(q, organization_id)
+        if match is None:
+            return None
+        fts = table(FTS_TABLE, column("rowid"))
+        # bm25 column weights: name, description, organization_id
+        rank = func.bm25(literal_column(FTS_TABLE), 5.0, 1.0, 0.0)
+        query = (
+            select(Project)
+            .join(fts, fts.c.rowid == Project.id)
+            .where(literal_column(FTS_TABLE).op("MATCH")(match))
+            .order_by(rank, Project.id.desc())
+        )
+    elif dialect == "postgresql":
+        if not _TOKEN.search(q):
+            return None
+        document = literal_column(_POSTGRES_DOCUMENT)
+        ts_query = func.websearch_to_tsquery(literal_column("'simple'"), q)
+        query = (
+            select(Project)
+            .where(document.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(document, ts_query).desc(), Project.id.desc())
+        )
+    else:
+        return like_search_query(organization_id, q, status)
+
+    query = query.where(Project.organization_id == organization_id)
+    if status:
+        query = query.where(Project.status == status)
+    return query
@@ -1,19 +1,36 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.lru import TTLCache
+from app.core.metrics import registry
+from app.core.password_pool import password_pool
 from app.schemas.user import TokenData
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified claims keyed by SHA-256 of the raw token, kept until the token's exp
+_token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -29,7 +46,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     )
     return encoded_jwt
 
-def decode_token(token: str) -> TokenData:
+def _verify_token(token: str) -> Tuple[TokenData, Optional[float]]:
     try:
         payload = jwt.decode(
             token, 
@@ -45,9 +62,37 @@ def decode_token(token: str) -> TokenData:
                 detail="Invalid authentication credentials"
             )
         
-        return TokenData(user_id=user_id, organization_id=organization_id)
+        return TokenData(user_id=user_id, organization_id=organization_id), payload.get("exp")
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
-        )
\ No newline at end of file
+        )
+
+def decode_token(token: str) -> TokenData:
+    digest = hashlib.sha256(token.encode()).digest()
+    token_data = _token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+    
+    token_data, expires_at = _verify_token(token)
+    ttl = expires_at - time.time() if expires_at is not None else None
+    if ttl is None or ttl > 0:
+        _token_cache.set(digest, token_data, ttl=ttl)
+    return token_data
+
+registry.counter(
+    "token_cache_hits_total",
+    "Bearer tokens resolved from the verified-claims cache",
+    callback=lambda: _token_cache.hits
+)
+registry.counter(
+    "token_cache_misses_total",
+    "Bearer tokens that required full JWT verification",
+    callback=lambda: _token_cache.misses
+)
+registry.gauge(
+    "token_cache_entries",
+    "Verified tokens currently cached",
+    callback=lambda: len(_token_cache)
+)
\ No newline at end of file
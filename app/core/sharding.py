@@ -0,0 +1,328 @@
+import argparse
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List
+from sqlalchemy import select, insert, update, delete, func, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.types import SchemaType
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, build_engine, engine
+from app.core.lru import TTLCache
+from app.core.metrics import registry
+from app.core.search import ensure_search_index
+from app.models.organization import Organization
+from app.models.project import Project, ProjectCounter
+from app.models.tenant_shard import TenantShard
+# Mapped class Project's relationships refer to, for standalone (CLI) use
+import app.models.user  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+# Tenant data that lives on the organization's shard. Organizations, users
+# and the shard directory stay on the primary, which is also a shard itself.
+SHARD_TABLES = [Project.__table__, ProjectCounter.__table__]
+
+PRIMARY_SHARD = "primary"
+
+@dataclass(frozen=True, slots=True)
+class Placement:
+    shard: str
+    read_only: bool = False
+
+def _parse_shard_urls(value: str) -> Dict[str, str]:
+    # "east=postgresql+asyncpg://...,west=sqlite+aiosqlite:///./west.db"
+    shards = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, _, url = entry.partition("=")
+        if not name or not url:
+            raise ValueError(f"SHARD_URLS entry must be name=url, got {entry!r}")
+        shards[name.strip()] = url.strip()
+    return shards
+
+def _create_shard_tables(connection):
+    # Foreign keys to organizations/users cannot cross databases, so shard
+    # tables are created without them; enum types are created first on
+    # backends that have them
+    inspector = inspect(connection)
+    for table in SHARD_TABLES:
+        if inspector.has_table(table.name):
+            continue
+        for column in table.columns:
+            if isinstance(column.type, SchemaType):
+                column.type.create(connection, checkfirst=True)
+        connection.execute(CreateTable(table, include_foreign_key_constraints=[]))
+        for index in table.indexes:
+            connection.execute(CreateIndex(index))
+
+class ShardRouter:
+    # Maps organization ids to shard engines through the tenant_shards
+    # directory. Lookups are cached per process for directory_ttl seconds,
+    # which is also how long a directory change takes to reach every worker.
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        shard_urls: Dict[str, str],
+        default_shard: str,
+        new_tenant_shards: List[str],
+        directory_ttl: float,
+        directory_size: int
+    ):
+        self.engines: Dict[str, AsyncEngine] = {PRIMARY_SHARD: primary}
+        for name, url in shard_urls.items():
+            self.engines[name] = build_engine(url, name=name)
+        self.sessionmakers = {
+            name: async_sessionmaker(shard_engine, class_=AsyncSession, expire_on_commit=False)
+            for name, shard_engine in self.engines.items()
+        }
+        self.default_shard = default_shard
+        # New tenants go to the configured shards, or the extra ones if any
+        self.new_tenant_shards = new_tenant_shards or list(shard_urls) or [PRIMARY_SHARD]
+        for name in [default_shard, *self.new_tenant_shards]:
+            if name not in self.engines:
+                raise ValueError(f"Unknown shard {name!r}")
+        self.directory_ttl = directory_ttl
+        self._directory = TTLCache(maxsize=directory_size, ttl=directory_ttl)
+
+    async def _read_placement(self, organization_id: int) -> Placement:
+        async with AsyncSessionLocal() as session:
+            row = (await session.execute(
+                select(TenantShard.shard, TenantShard.read_only)
+                .where(TenantShard.organization_id == organization_id)
+            )).first()
+        if row is None:
+            return Placement(self.default_shard)
+        if row.shard not in self.engines:
+            raise RuntimeError(f"Organization {organization_id} is on unconfigured shard {row.shard!r}")
+        return Placement(row.shard, row.read_only)
+
+    async def placement(self, organization_id: int) -> Placement:
+        placement = self._directory.get(organization_id)
+        if placement is None:
+            placement = await self._read_placement(organization_id)
+            self._directory.set(organization_id, placement)
+        return placement
+
+    def invalidate(self, organization_id: int):
+        self._directory.pop(organization_id)
+
+    @asynccontextmanager
+    async def session(self, organization_id: int):
+        placement = await self.placement(organization_id)
+        async with self.sessionmakers[placement.shard]() as session:
+            yield session
+
+    async def assign_new_tenant(self, db: AsyncSession, organization_id: int) -> str:
+        # Places a new organization on the candidate shard with the fewest
+        # tenants, inside the caller's (registration) transaction
+        counts = dict((await db.execute(
+            select(TenantShard.shard, func.count())
+            .where(TenantShard.shard.in_(self.new_tenant_shards))
+            .group_by(TenantShard.shard)
+        )).all())
+        shard = min(self.new_tenant_shards, key=lambda name: counts.get(name, 0))
+        await db.execute(insert(TenantShard).values(organization_id=organization_id, shard=shard))
+        self._directory.set(organization_id, Placement(shard))
+        return shard
+
+    async def create_schema(self):
+        # The primary's tables come from create_all/migrations; every shard
+        # gets the search index, which those do not create
+        for name, shard_engine in self.engines.items():
+            async with shard_engine.begin() as conn:
+                if name != PRIMARY_SHARD:
+                    await conn.run_sync(_create_shard_tables)
+                await conn.run_sync(ensure_search_index)
+
+    async def dispose(self):
+        for name, shard_engine in self.engines.items():
+            if name != PRIMARY_SHARD:
+                await shard_engine.dispose()
+
+shard_router = ShardRouter(
+    primary=engine,
+    shard_urls=_parse_shard_urls(settings.SHARD_URLS),
+    default_shard=settings.SHARD_DEFAULT,
+    new_tenant_shards=[name.strip() for name in settings.SHARD_NEW_TENANTS.split(",") if name.strip()],
+    directory_ttl=settings.SHARD_DIRECTORY_TTL_SECONDS,
+    directory_size=settings.SHARD_DIRECTORY_CACHE_SIZE
+)
+
+registry.counter(
+    "shard_directory_lookups_total",
+    "Shard directory lookups by result of the in-process cache",
+    callback=lambda: [
+        ({"result": "hit"}, shard_router._directory.hits),
+        ({"result": "miss"}, shard_router._directory.misses),
+    ]
+)
+
+# Moving a tenant between shards
+
+async def _set_placement(organization_id: int, shard: str, read_only: bool):
+    async with AsyncSessionLocal() as session:
+        updated = await session.execute(
+            update(TenantShard)
+            .where(TenantShard.organization_id == organization_id)
+            .values(shard=shard, read_only=read_only)
+        )
+        if updated.rowcount == 0:
+            await session.execute(
+                insert(TenantShard).values(organization_id=organization_id, shard=shard, read_only=read_only)
+            )
+        await session.commit()
+    shard_router.invalidate(organization_id)
+
+async def _wait_for_directory(wait: bool, reason: str):
+    # Other workers keep their cached placement for up to directory_ttl
+    if wait:
+        delay = shard_router.directory_ttl + 1
+        logger.info("Waiting %.0fs for workers to see %s", delay, reason)
+        await asyncio.sleep(delay)
+
+async def _reset_sequence(session: AsyncSession, table):
+    # Explicit ids do not advance a Postgres serial; move it past them
+    if session.bind.dialect.name == "postgresql":
+        await session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"GREATEST((SELECT MAX(id) FROM {table.name}), 1))"
+        ))
+
+async def move_tenant(organization_id: int, target: str, batch_size: int = 1000, wait: bool = True) -> int:
+    # Copies the tenant's rows to the target shard under a write freeze,
+    # switches the directory, then removes them from the source. Ids are
+    # preserved (they appear in URLs, ETags and client state); they are unique
+    # across shards (app.core.ids), so a collision can only involve rows
+    # inserted around the allocator, and the move is refused then.
+    if target not in shard_router.engines:
+        raise ValueError(f"Unknown shard {target!r}")
+    async with AsyncSessionLocal() as session:
+        if await session.get(Organization, organization_id) is None:
+            raise ValueError(f"Unknown organization {organization_id}")
+
+    source = (await shard_router._read_placement(organization_id)).shard
+    if source == target:
+        logger.info("Organization %s is already on %s", organization_id, target)
+        return 0
+
+    await _set_placement(organization_id, source, read_only=True)
+    try:
+        await _wait_for_directory(wait, "the write freeze")
+
+        copied = 0
+        copied_ids = {}
+        async with shard_router.sessionmakers[source]() as source_session, \
+                shard_router.sessionmakers[target]() as target_session:
+            for table in SHARD_TABLES:
+                # Leftovers of an earlier, aborted move of this tenant
+                await target_session.execute(
+                    delete(table).where(table.c.organization_id == organization_id)
+                )
+                result = await source_session.stream(
+                    select(table)
+                    .where(table.c.organization_id == organization_id)
+                    .execution_options(yield_per=batch_size)
+                )
+                async for rows in result.mappings().partitions():
+                    if "id" in table.c:
+                        ids = [row["id"] for row in rows]
+                        copied_ids.setdefault(table.name, []).extend(ids)
+                        taken = await target_session.scalar(
+                            select(func.count()).select_from(table).where(table.c.id.in_(ids))
+                        )
+                        if taken:
+                            raise RuntimeError(
+                                f"{taken} {table.name} ids of organization {organization_id} already exist on {target}"
+                            )
+                    await target_session.execute(insert(table), [dict(row) for row in rows])
+                    copied += len(rows)
+                if "id" in table.c:
+                    await _reset_sequence(target_session, table)
+
+                source_count = await source_session.scalar(
+                    select(func.count()).select_from(table).where(table.c.organization_id == organization_id)
+                )
+                target_count = await target_session.scalar(
+                    select(func.count()).select_from(table).where(table.c.organization_id == organization_id)
+                )
+                if source_count != target_count:
+                    raise RuntimeError(
+                        f"{table.name}: copied {target_count} rows but source has {source_count}"
+                    )
+            await target_session.commit()
+    except BaseException:
+        await _set_placement(organization_id, source, read_only=False)
+        raise
+
+    await _set_placement(organization_id, target, read_only=False)
+    logger.info("Organization %s moved from %s to %s (%s rows)", organization_id, source, target, copied)
+
+    # Readers with the old placement cached still use the source until then.
+    # Only the copied rows are removed: anything a write that began before
+    # the freeze committed afterwards is left in place and reported
+    await _wait_for_directory(wait, "the new placement")
+    async with shard_router.sessionmakers[source]() as source_session:
+        for table in SHARD_TABLES:
+            tenant_rows = table.c.organization_id == organization_id
+            if "id" not in table.c:
+                # Counter rows have no id; the copy on the target is the one in use now
+                await source_session.execute(delete(table).where(tenant_rows))
+                continue
+            ids = copied_ids.get(table.name, [])
+            for start in range(0, len(ids), batch_size):
+                await source_session.execute(
+                    delete(table).where(tenant_rows, table.c.id.in_(ids[start:start + batch_size]))
+                )
+        await source_session.commit()
+
+        for table in SHARD_TABLES:
+            left = await source_session.scalar(
+                select(func.count()).select_from(table).where(table.c.organization_id == organization_id)
+            )
+            if left:
+                raise RuntimeError(
+                    f"{left} {table.name} rows of organization {organization_id} were written to {source} "
+                    f"during the move and were not copied to {target}; they are still on {source}"
+                )
+
+    return copied
+
+async def _main(args):
+    try:
+        if args.command == "schema":
+            await shard_router.create_schema()
+            print(f"Shard tables present on: {', '.join(shard_router.engines)}")
+        elif args.command == "list":
+            async with AsyncSessionLocal() as session:
+                rows = (await session.execute(
+                    select(TenantShard.shard, func.count()).group_by(TenantShard.shard)
+                )).all()
+            counts = dict(rows)
+            for name in shard_router.engines:
+                print(f"{name}\t{counts.get(name, 0)} tenants")
+        elif args.command == "move":
+            await shard_router.create_schema()
+            copied = await move_tenant(args.org, args.to, args.batch_size, wait=not args.no_wait)
+            print(f"Moved organization {args.org} to {args.to}: {copied} rows")
+    finally:
+        await shard_router.dispose()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tenant shard maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("schema", help="create tenant tables on every configured shard")
+    commands.add_parser("list", help="show tenants per shard")
+    move_parser = commands.add_parser("move", help="move an organization to another shard")
+    move_parser.add_argument("--org", type=int, required=True)
+    move_parser.add_argument("--to", required=True)
+    move_parser.add_argument("--batch-size", type=int, default=1000)
+    move_parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="skip waiting for workers' directory caches (only when no app workers are running)"
+    )
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
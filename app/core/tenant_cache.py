@@ -0,0 +1,25 @@
+from app.core.cache import cache
+from app.core.replicas import replica_router
+
+# Per-tenant cache generations. Every cache key for a tenant's data embeds the
+# tenant's current generation, so bumping it with a single INCR makes all
+# cached pages/filters for that tenant unreachable at once; the orphaned
+# entries simply age out through their TTL.
+
+def _generation_key(namespace: str, organization_id: int) -> str:
+    return f"{namespace}:org:{organization_id}:gen"
+
+async def get_generation(namespace: str, organization_id: int) -> int:
+    return await cache.get_counter(_generation_key(namespace, organization_id))
+
+async def bump_generation(namespace: str, organization_id: int):
+    # Called after a write commits. The read-your-writes window is restarted
+    # first, so whoever sees the new generation also reads from the primary
+    # and nothing stale from a lagging replica is cached or tagged under it;
+    # the mark set when the write began may have expired by now (imports).
+    await replica_router.mark_write(organization_id)
+    await cache.incr(_generation_key(namespace, organization_id))
+
+async def tenant_cache_prefix(namespace: str, organization_id: int) -> str:
+    generation = await get_generation(namespace, organization_id)
+    return f"{namespace}:org:{organization_id}:gen:{generation}"
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, BigInteger, String
+from app.core.database import Base
+
+class IdSequence(Base):
+    # Next unassigned id of a sharded table, shared by every shard so ids
+    # stay unique when tenants move between them. Lives on the primary.
+    __tablename__ = "id_sequences"
+    
+    name = Column(String, primary_key=True)
+    next_id = Column(BigInteger, nullable=False)
+    
+    def __repr__(self):
+        return f"<IdSequence {self.name} next={self.next_id}>"
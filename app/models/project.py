@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -21,8 +21,33 @@ class Project(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Serves the tenant list ordering and keyset seeks on (created_at, id)
+    __table_args__ = (
+        Index(
+            "ix_projects_org_status_created",
+            organization_id,
+            status,
+            created_at.desc(),
+            id.desc(),
+        ),
+    )
+    
     organization = relationship("Organization", back_populates="projects")
     creator = relationship("User", back_populates="projects")
     
     def __repr__(self):
-        return f"<Project {self.name}>"
\ No newline at end of file
+        return f"<Project {self.name}>"
+
+class ProjectCounter(Base):
+    # Number of an organization's projects per status, kept up to date by the
+    # project write paths in the same transaction as the rows they change, so
+    # totals are read without counting. Lives on the tenant's shard next to
+    # its projects; app.core.project_counters repairs any drift.
+    __tablename__ = "project_counters"
+    
+    organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    status = Column(SQLEnum(ProjectStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    def __repr__(self):
+        return f"<ProjectCounter {self.organization_id} {self.status}={self.count}>"
\ No newline at end of file
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy.sql import func, false
+from app.core.database import Base
+
+class TenantShard(Base):
+    # Shard directory: which database holds an organization's tenant data.
+    # Lives on the primary next to organizations; tenants without a row are
+    # on SHARD_DEFAULT.
+    __tablename__ = "tenant_shards"
+    
+    organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    shard = Column(String, nullable=False, index=True)
+    # Set while the tenant is being moved; writes are refused until cleared
+    read_only = Column(Boolean, nullable=False, default=False, server_default=false())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<TenantShard {self.organization_id} -> {self.shard}>"
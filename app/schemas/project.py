@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional
+import enum
 from app.models.project import ProjectStatus
 
 class ProjectBase(BaseModel):
@@ -27,7 +28,49 @@ class ProjectResponse(ProjectBase):
 
 class ProjectList(BaseModel):
     projects: list[ProjectResponse]
+    total: Optional[int] = None
+    page: int
+    limit: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class ProjectStats(BaseModel):
     total: int
+    by_status: dict[ProjectStatus, int]
+
+class ProjectSearchResults(BaseModel):
+    query: str
+    projects: list[ProjectResponse]
     page: int
     limit: int
-    total_pages: int
\ No newline at end of file
+    has_more: bool
+
+class ProjectBulkUpdateItem(ProjectUpdate):
+    id: int
+
+class ProjectBulkDelete(BaseModel):
+    ids: list[int]
+
+class ProjectBulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    result: str
+    project: Optional[ProjectResponse] = None
+
+class ProjectBulkResult(BaseModel):
+    results: list[ProjectBulkItemResult]
+
+class ProjectFileFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class ProjectImportError(BaseModel):
+    row: int
+    error: str
+
+class ProjectImportResult(BaseModel):
+    inserted: int
+    failed: int
+    batches: int
+    errors: list[ProjectImportError]
+    errors_truncated: bool = False
\ No newline at end of file
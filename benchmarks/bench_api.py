@@ -0,0 +1,350 @@
+"""End-to-end throughput/latency benchmark for the API hot paths.
+
+Spins the app up in-process (ASGI, no network) against a fresh SQLite file
+with the in-memory cache backend standing in for Redis, seeds
+ORGS x USERS x PROJECTS rows, then drives each scenario with a fixed
+concurrency and reports throughput plus p50/p95/p99 latency as JSON so runs
+from different commits can be diffed.
+
+Requires httpx (not a runtime dependency of the app).
+
+Run with:
+    python -m benchmarks.bench_api --orgs 5 --users 3 --projects 2000 \\
+        --requests 500 --concurrency 16 --output bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SCENARIOS = [
+    "auth_login",
+    "users_me",
+    "projects_list_cached",
+    "projects_list_uncached",
+    "projects_list_deep_offset",
+    "projects_list_deep_cursor",
+    "projects_create",
+    "projects_update",
+    "projects_delete",
+]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orgs", type=int, default=3)
+    parser.add_argument("--users", type=int, default=2, help="users per organization")
+    parser.add_argument("--projects", type=int, default=1000, help="projects per organization")
+    parser.add_argument("--requests", type=int, default=300, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=40, help="requests for auth_login (bcrypt bound)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated subset")
+    parser.add_argument("--db", help="SQLite file to create (default: a temporary file)")
+    parser.add_argument("--overwrite", action="store_true", help="replace the --db file if it exists")
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    return parser.parse_args(argv)
+
+def configure_environment(args):
+    # Must run before anything under app/ is imported: settings are read at import
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    db_path = args.db or os.path.join(workdir, "bench.db")
+    if os.path.exists(db_path):
+        if not args.overwrite:
+            raise SystemExit(f"{db_path} exists; pass --overwrite to replace it")
+        os.remove(db_path)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    # Request logging would cost time in every scenario; what is left goes
+    # to a file of its own and stderr, not into the report
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LOG_FILE", os.path.join(workdir, "app.log"))
+    os.environ["CACHE_BACKEND"] = "memory"
+    # The benchmark drives one organization far past a tenant's fair share
+    os.environ["RATE_LIMIT_ENABLED"] = "False"
+    os.environ.setdefault("DEBUG", "False")
+    return db_path
+
+def summarize(latencies, wall_time, errors):
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / wall_time if wall_time else None,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else None,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": ordered[-1] * 1000 if ordered else None,
+    }
+
+async def drive(count, concurrency, make_request, expected_status, before_each=None):
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < count:
+            index = next_index
+            next_index += 1
+            if before_each is not None:
+                await before_each(index)
+            start = time.perf_counter()
+            response = await make_request(index)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected_status:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+async def seed(args):
+    from collections import Counter
+    from sqlalchemy import insert
+    from app.core.database import AsyncSessionLocal
+    from app.core.ids import id_allocator
+    from app.core.project_counters import adjust_project_counts
+    from app.core.security import get_password_hash
+    from app.models.organization import Organization
+    from app.models.project import Project, ProjectStatus
+    from app.models.user import User, UserRole
+
+    password = "bench-password"
+    password_hash = get_password_hash(password)
+    statuses = list(ProjectStatus)
+    accounts = []
+    # Taken before the session below writes: on SQLite the allocator's own
+    # transaction would wait for it
+    project_ids = iter(await id_allocator.allocate(Project.__table__, args.orgs * args.projects))
+
+    async with AsyncSessionLocal() as session:
+        for org_index in range(args.orgs):
+            org_id = await session.scalar(
+                insert(Organization)
+                .values(name=f"Bench Org {org_index}", subdomain=f"bench{org_index}")
+                .returning(Organization.id)
+            )
+            user_ids = []
+            for user_index in range(args.users):
+                email = f"user{user_index}@bench{org_index}.example.com"
+                user_id = await session.scalar(
+                    insert(User)
+                    .values(
+                        email=email,
+                        password_hash=password_hash,
+                        full_name=f"Bench User {user_index}",
+                        organization_id=org_id,
+                        role=UserRole.ADMIN if user_index == 0 else UserRole.MEMBER
+                    )
+                    .returning(User.id)
+                )
+                user_ids.append(user_id)
+                accounts.append({"email": email, "password": password, "org_id": org_id})
+
+            for start in range(0, args.projects, 1000):
+                rows = [
+                    {
+                        "id": next(project_ids),
+                        "name": f"Project {index}",
+                        "description": f"Benchmark project {index} of org {org_index}",
+                        "status": statuses[index % len(statuses)],
+                        "organization_id": org_id,
+                        "created_by": user_ids[0],
+                    }
+                    for index in range(start, min(start + 1000, args.projects))
+                ]
+                await session.execute(insert(Project), rows)
+                await adjust_project_counts(session, org_id, Counter(row["status"] for row in rows))
+        await session.commit()
+
+    return accounts
+
+async def run(args):
+    import httpx
+    from main import app
+    from app.core.tenant_cache import bump_generation
+
+    selected = [name for name in args.scenarios.split(",") if name]
+    results = {}
+
+    async with app.router.lifespan_context(app):
+        seed_start = time.perf_counter()
+        accounts = await seed(args)
+        seed_seconds = time.perf_counter() - seed_start
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Admin of the first org drives everything but the login scenario
+            admin = accounts[0]
+            login = await client.post("/api/v1/auth/login", json={
+                "email": admin["email"], "password": admin["password"]
+            })
+            login.raise_for_status()
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            org_id = admin["org_id"]
+            limit = args.page_size
+            deep_page = max(1, args.projects // limit)
+
+            async def invalidate(_):
+                await bump_generation("projects", org_id)
+
+            async def list_page(page):
+                return await client.get(
+                    "/api/v1/projects/", params={"page": page, "limit": limit}, headers=headers
+                )
+
+            if "auth_login" in selected:
+                results["auth_login"] = await drive(
+                    args.login_requests,
+                    args.concurrency,
+                    lambda i: client.post("/api/v1/auth/login", json={
+                        "email": accounts[i % len(accounts)]["email"],
+                        "password": accounts[i % len(accounts)]["password"],
+                    }),
+                    200
+                )
+
+            if "users_me" in selected:
+                results["users_me"] = await drive(
+                    args.requests, args.concurrency,
+                    lambda i: client.get("/api/v1/users/me", headers=headers), 200
+                )
+
+            if "projects_list_cached" in selected:
+                await list_page(1)
+                results["projects_list_cached"] = await drive(
+                    args.requests, args.concurrency, lambda i: list_page(1), 200
+                )
+
+            if "projects_list_uncached" in selected:
+                results["projects_list_uncached"] = await drive(
+                    args.requests, args.concurrency, lambda i: list_page(1), 200,
+                    before_each=invalidate
+                )
+
+            if "projects_list_deep_offset" in selected:
+                results["projects_list_deep_offset"] = await drive(
+                    args.requests, args.concurrency, lambda i: list_page(deep_page), 200,
+                    before_each=invalidate
+                )
+
+            if "projects_list_deep_cursor" in selected:
+                # Walk to the same depth once to obtain a cursor, then time seeks
+                # from it; a failed page ends the walk and is reported
+                cursor = None
+                walk_errors = 0
+                for _ in range(deep_page - 1):
+                    params = {"limit": limit, "include_total": "false"}
+                    if cursor:
+                        params["after"] = cursor
+                    response = await client.get("/api/v1/projects/", params=params, headers=headers)
+                    if response.status_code != 200:
+                        walk_errors += 1
+                        break
+                    cursor = response.json()["next_cursor"] or cursor
+                results["projects_list_deep_cursor"] = await drive(
+                    args.requests, args.concurrency,
+                    lambda i: client.get("/api/v1/projects/", params={
+                        "limit": limit, "include_total": "false", **({"after": cursor} if cursor else {})
+                    }, headers=headers),
+                    200,
+                    before_each=invalidate
+                )
+                results["projects_list_deep_cursor"]["setup_errors"] = walk_errors
+
+            created_ids = []
+
+            async def create(i):
+                response = await client.post(
+                    "/api/v1/projects/", json={"name": f"Bench created {i}"}, headers=headers
+                )
+                if response.status_code == 201:
+                    created_ids.append(response.json()["id"])
+                return response
+
+            if {"projects_create", "projects_update", "projects_delete"} & set(selected):
+                create_result = await drive(args.requests, args.concurrency, create, 201)
+                if "projects_create" in selected:
+                    results["projects_create"] = create_result
+
+            if "projects_update" in selected and created_ids:
+                results["projects_update"] = await drive(
+                    args.requests, args.concurrency,
+                    lambda i: client.put(
+                        f"/api/v1/projects/{created_ids[i % len(created_ids)]}",
+                        json={"description": f"updated {i}"},
+                        headers=headers
+                    ),
+                    200
+                )
+
+            if "projects_delete" in selected and created_ids:
+                results["projects_delete"] = await drive(
+                    min(args.requests, len(created_ids)), args.concurrency,
+                    lambda i: client.delete(f"/api/v1/projects/{created_ids[i]}", headers=headers),
+                    204
+                )
+
+    return results, seed_seconds
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_path = configure_environment(args)
+    # The app prints its startup banner and may log to stdout, which carries
+    # the report when --output is not given
+    with contextlib.redirect_stdout(sys.stderr):
+        results, seed_seconds = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": db_path,
+            "seed_seconds": seed_seconds,
+            "params": {
+                "orgs": args.orgs,
+                "users": args.users,
+                "projects": args.projects,
+                "requests": args.requests,
+                "login_requests": args.login_requests,
+                "concurrency": args.concurrency,
+                "page_size": args.page_size,
+            },
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
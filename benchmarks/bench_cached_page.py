@@ -0,0 +1,68 @@
+"""Per-hit CPU cost of serving a cached GET /projects page.
+
+Compares the previous hit path (json.loads of the cached value, validation
+through ProjectList, then FastAPI's jsonable_encoder + JSONResponse render)
+with serving the stored response body bytes directly.
+
+Run with: python -m benchmarks.bench_cached_page [items] [iterations]
+"""
+import json
+import struct
+import sys
+import timeit
+from datetime import datetime
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.schemas.project import ProjectList
+
+def build_page(items: int) -> ProjectList:
+    now = datetime.utcnow()
+    return ProjectList(
+        projects=[
+            {
+                "id": i,
+                "name": f"Project {i}",
+                "description": "Lorem ipsum dolor sit amet " * 4,
+                "status": "active",
+                "organization_id": 1,
+                "created_by": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(items)
+        ],
+        total=items * 10,
+        page=1,
+        limit=items,
+        total_pages=10,
+    )
+
+def main(items: int = 100, iterations: int = 2000):
+    page = build_page(items)
+    cached_json = json.dumps(page.model_dump(mode="json"))
+    header = struct.Struct("!d")
+    cached_bytes = header.pack(0.0) + page.model_dump_json().encode()
+
+    def before():
+        data = json.loads(cached_json)
+        model = ProjectList(**data)
+        return JSONResponse(jsonable_encoder(model)).body
+
+    def after():
+        body = cached_bytes[header.size:]
+        return Response(content=body, media_type="application/json").body
+
+    assert json.loads(before()) == json.loads(after())
+
+    old = timeit.timeit(before, number=iterations)
+    new = timeit.timeit(after, number=iterations)
+
+    print(f"items per page: {items}, iterations: {iterations}")
+    print(f"decode + validate + encode: {old / iterations * 1e6:9.1f} us/hit")
+    print(f"pre-serialized bytes:       {new / iterations * 1e6:9.1f} us/hit")
+    print(f"speedup:                    {old / new:9.1f}x")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
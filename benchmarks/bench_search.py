@@ -0,0 +1,167 @@
+"""Full-text project search versus a naive LIKE scan on a large tenant.
+
+Seeds a fresh SQLite file with ORGS organizations of PROJECTS projects each
+(names and descriptions drawn from a Zipf-distributed vocabulary, so rare
+and common terms both occur), builds the search index the app uses, then times the
+statement behind GET /projects/search against the LIKE fallback for the
+same queries, fetching one page of results. Reports JSON.
+
+Run with:
+    python -m benchmarks.bench_search --orgs 3 --projects 100000 --iterations 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+VOCABULARY_SIZE = 5000
+SYLLABLES = ["ka", "lo", "mi", "ren", "tu", "sa", "vor", "el", "din", "qua", "ph", "ox"]
+
+def vocabulary():
+    # Deterministic pseudo-words; word frequency follows Zipf's law as in
+    # natural text, so the first words are very common and the tail is rare
+    rng = random.Random(7)
+    seen = set()
+    while len(seen) < VOCABULARY_SIZE:
+        seen.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(seen, key=lambda word: (len(word), word))
+
+WORDS = vocabulary()
+WEIGHTS = [1 / rank for rank in range(1, VOCABULARY_SIZE + 1)]
+
+# Very common, common, rare, two-term and prefix queries
+QUERIES = [WORDS[0], WORDS[20], WORDS[3000], f"{WORDS[5]} {WORDS[40]}", WORDS[100][:-1]]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orgs", type=int, default=3)
+    parser.add_argument("--projects", type=int, default=50000, help="projects per organization")
+    parser.add_argument("--iterations", type=int, default=20, help="runs per query and method")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--db", help="SQLite file to use (default: a temporary file)")
+    return parser.parse_args(argv)
+
+def configure_environment(args):
+    # Must run before anything under app/ is imported: settings are read at import
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="bench-"), "search.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["CACHE_BACKEND"] = "none"
+    return db_path
+
+def words(rng, count):
+    return " ".join(rng.choices(WORDS, weights=WEIGHTS, k=count))
+
+async def seed(args):
+    from sqlalchemy import insert
+    from app.core.database import AsyncSessionLocal
+    from app.models.organization import Organization
+    from app.models.project import Project
+    from app.models.user import User
+
+    rng = random.Random(42)
+    async with AsyncSessionLocal() as session:
+        for org_index in range(args.orgs):
+            org_id = await session.scalar(
+                insert(Organization)
+                .values(name=f"Search Org {org_index}", subdomain=f"search{org_index}")
+                .returning(Organization.id)
+            )
+            user_id = await session.scalar(
+                insert(User)
+                .values(
+                    email=f"owner@search{org_index}.example.com",
+                    password_hash="x",
+                    full_name="Owner",
+                    organization_id=org_id
+                )
+                .returning(User.id)
+            )
+            for start in range(0, args.projects, 5000):
+                await session.execute(insert(Project), [
+                    {
+                        "name": f"{words(rng, 3)} {index}",
+                        "description": words(rng, 20),
+                        "organization_id": org_id,
+                        "created_by": user_id,
+                    }
+                    for index in range(start, min(start + 5000, args.projects))
+                ])
+        await session.commit()
+
+async def time_query(session, query, iterations, limit):
+    timings = []
+    rows = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await session.execute(query.limit(limit))
+        rows = len(result.scalars().all())
+        timings.append(time.perf_counter() - start)
+        session.expunge_all()
+    return {
+        "rows": rows,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "p50_ms": statistics.median(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+    }
+
+async def run(args):
+    from app.core.database import AsyncSessionLocal, Base, engine
+    from app.core.search import like_search_query, search_query
+    from app.core.sharding import shard_router
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # Creates the FTS table and triggers before seeding so inserts are indexed
+    await shard_router.create_schema()
+
+    seed_start = time.perf_counter()
+    await seed(args)
+    seed_seconds = time.perf_counter() - seed_start
+
+    # The last organization is searched, so the LIKE scan cannot stop early
+    # on the other tenants' rows
+    organization_id = args.orgs
+    results = {}
+    async with AsyncSessionLocal() as session:
+        for q in QUERIES:
+            results[q] = {
+                "fts": await time_query(
+                    session, search_query("sqlite", organization_id, q), args.iterations, args.page_size
+                ),
+                "like": await time_query(
+                    session, like_search_query(organization_id, q), args.iterations, args.page_size
+                ),
+            }
+            results[q]["speedup"] = results[q]["like"]["p50_ms"] / results[q]["fts"]["p50_ms"]
+
+    await shard_router.dispose()
+    await engine.dispose()
+    return results, seed_seconds
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_path = configure_environment(args)
+    results, seed_seconds = asyncio.run(run(args))
+    print(json.dumps({
+        "meta": {
+            "database": db_path,
+            "seed_seconds": seed_seconds,
+            "params": {
+                "orgs": args.orgs,
+                "projects": args.projects,
+                "iterations": args.iterations,
+                "page_size": args.page_size,
+            },
+        },
+        "results": results,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
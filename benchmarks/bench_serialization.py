@@ -0,0 +1,116 @@
+"""Encode time and bytes sent for the list endpoints' response bodies.
+
+Builds a page of ProjectResponse items (GET /projects, the bulk endpoints)
+and a list of UserResponse items (GET /users) and times the response path
+after validation: pydantic's JSON-mode dump followed by the stdlib
+JSONResponse render, or by the ORJSONResponse the app now uses, and for
+projects also the pre-rendered model_dump_json body of the cached list
+pages. Then reports the size and compression time of each body as sent
+uncompressed, with gzip and, when the brotli package is installed, brotli.
+
+Run with: python -m benchmarks.bench_serialization [items] [iterations]
+"""
+import json
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import List
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.core.compression import _BrotliEncoder, _GzipEncoder, brotli
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.models.project import ProjectStatus
+from app.models.user import UserRole
+from app.schemas.project import ProjectList
+from app.schemas.user import UserResponse
+
+def build_projects(items: int) -> ProjectList:
+    now = datetime.now(timezone.utc)
+    statuses = list(ProjectStatus)
+    return ProjectList(
+        projects=[
+            {
+                "id": i,
+                "name": f"Project {i}",
+                "description": "Lorem ipsum dolor sit amet " * 4,
+                "status": statuses[i % len(statuses)],
+                "organization_id": 1,
+                "created_by": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(items)
+        ],
+        total=items * 10,
+        page=1,
+        limit=items,
+        total_pages=10,
+    )
+
+def build_users(items: int) -> List[UserResponse]:
+    now = datetime.now(timezone.utc)
+    return [
+        UserResponse(
+            id=i,
+            email=f"user{i}@example.com",
+            full_name=f"User {i}",
+            role=UserRole.ADMIN if i % 10 == 0 else UserRole.MEMBER,
+            organization_id=1,
+            is_active=True,
+            created_at=now,
+        )
+        for i in range(items)
+    ]
+
+def per_call_us(func, iterations: int) -> float:
+    return timeit.timeit(func, number=iterations) / iterations * 1e6
+
+def encoders():
+    yield "gzip", lambda: _GzipEncoder(settings.COMPRESSION_GZIP_LEVEL)
+    if brotli is not None:
+        yield "br", lambda: _BrotliEncoder(settings.COMPRESSION_BROTLI_QUALITY)
+
+def report(name: str, adapter: TypeAdapter, value, iterations: int, prerendered=None):
+    # What FastAPI does with a response_model once the value is validated
+    def stdlib():
+        return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+    def orjson():
+        return ORJSONResponse(adapter.dump_python(value, mode="json")).body
+
+    body = orjson()
+    assert body == stdlib(), "orjson and stdlib bodies differ"
+
+    print(f"{name}")
+    print(f"  encode  stdlib json:      {per_call_us(stdlib, iterations):9.1f} us")
+    print(f"  encode  orjson:           {per_call_us(orjson, iterations):9.1f} us")
+    if prerendered is not None:
+        assert json.loads(prerendered()) == json.loads(body)
+        print(f"  encode  model_dump_json:  {per_call_us(prerendered, iterations):9.1f} us")
+    print(f"  bytes   identity:         {len(body):9d}")
+    for encoding, make_encoder in encoders():
+        compressed = make_encoder().compress(body, final=True)
+        took = per_call_us(lambda: make_encoder().compress(body, final=True), max(1, iterations // 10))
+        print(
+            f"  bytes   {encoding:<5}             {len(compressed):9d}"
+            f"  ({len(compressed) / len(body):.1%}, {took:.1f} us to compress)"
+        )
+    if brotli is None:
+        print("  (brotli not installed; br skipped)")
+
+def main(items: int = 100, iterations: int = 2000):
+    print(f"items per list: {items}, iterations: {iterations}")
+    page = build_projects(items)
+    report(
+        "GET /projects (ProjectList)",
+        TypeAdapter(ProjectList),
+        page,
+        iterations,
+        prerendered=lambda: page.model_dump_json().encode()
+    )
+    report("GET /users (list[UserResponse])", TypeAdapter(List[UserResponse]), build_users(items), iterations)
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
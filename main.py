@@ -1,11 +1,24 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 import uvicorn
 from dotenv import load_dotenv
 from app.core.database import engine, Base
 from app.api import api_router
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, stop_logging, RequestContextMiddleware
 from app.core.config import settings
+from app.core.metrics import registry
+from app.core.health import health_checker
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.sharding import shard_router
+from app.core.replicas import replica_router
+from app.core.instrumentation import TimingMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.responses import ORJSONResponse
+from app.core.password_pool import password_pool
+from app.core.last_login import last_login_buffer
+from app.core.redis_client import redis_client
 
 load_dotenv()
 print(f"🔧 Database URL: {settings.DATABASE_URL}")
@@ -17,9 +30,21 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting FastAPI Multi-Tenant SaaS Backend")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    yield
-    # Shutdown
-    await engine.dispose()
+    await shard_router.create_schema()
+    await redis_client.connect()
+    last_login_buffer.start()
+    replica_router.start()
+    try:
+        yield
+    finally:
+        # Shutdown, also when the app is torn down by an exception
+        await last_login_buffer.stop()
+        await replica_router.stop()
+        await redis_client.disconnect()
+        password_pool.shutdown()
+        await shard_router.dispose()
+        await engine.dispose()
+        stop_logging()
 
 app = FastAPI(
     title="Multi-Tenant SaaS API",
@@ -27,14 +52,38 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(TimingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z"}
+    return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+@app.get("/health/live")
+async def liveness():
+    # The process is up and serving; dependencies are checked by /health/ready
+    return {"status": "alive", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+@app.get("/health/ready")
+async def readiness():
+    report = await health_checker.readiness()
+    status_code = 200 if report["status"] == "ready" else 503
+    return ORJSONResponse(report, status_code=status_code)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
 
 if __name__ == "__main__":
     uvicorn.run(
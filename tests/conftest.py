@@ -0,0 +1,67 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read when app modules are imported, so the test environment is
+# in place before main (and with it everything under app/) is imported below:
+# a throwaway SQLite database and no rate limiting. CACHE_BACKEND is "redis"
+# without a REDIS_URL, so the L2 tier is off until a test hands redis_client a
+# fakeredis client (cache_tier).
+_workdir = tempfile.mkdtemp(prefix="tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ["LOG_FILE"] = os.path.join(_workdir, "app.log")
+os.environ["CACHE_BACKEND"] = "redis"
+os.environ.pop("REDIS_URL", None)
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+os.environ["DEBUG"] = "False"
+
+import fakeredis
+import httpx
+import pytest
+from app.core.cache import cache
+from app.core.redis_client import redis_client
+from main import app as asgi_app
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+async def app():
+    async with asgi_app.router.lifespan_context(asgi_app):
+        yield asgi_app
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+@pytest.fixture(params=["l1", "l2"])
+def cache_tier(request):
+    # "l1": the in-process tier alone. "l2": a shared Redis tier (fakeredis)
+    # behind it; tests drop L1 before reading to be served from L2.
+    cache.clear()
+    redis_client.client = fakeredis.aioredis.FakeRedis() if request.param == "l2" else None
+    try:
+        yield request.param
+    finally:
+        redis_client.client = None
+        cache.clear()
+
+@pytest.fixture
+async def auth_headers(client):
+    # A fresh organization per test, so tests never see each other's projects
+    suffix = uuid.uuid4().hex[:12]
+    email = f"admin-{suffix}@example.com"
+    response = await client.post("/api/v1/auth/register", json={
+        "email": email,
+        "full_name": "Test Admin",
+        "password": "secret-password",
+        "organization_name": f"Org {suffix}",
+        "subdomain": f"org-{suffix}",
+    })
+    assert response.status_code == 201, response.text
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": "secret-password"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,26 @@
+import pytest
+
+# Responses are compressed with the best coding the client accepts
+
+pytestmark = pytest.mark.anyio
+
+async def list_response(client, headers, accept_encoding):
+    # Enough projects for the body to pass COMPRESSION_MINIMUM_SIZE
+    response = await client.post("/api/v1/projects/bulk", json=[
+        {"name": f"project {i}", "description": "compressible " * 10} for i in range(20)
+    ], headers=headers)
+    assert response.status_code == 201, response.text
+    return await client.get("/api/v1/projects/", params={"limit": 20}, headers={
+        **headers, "Accept-Encoding": accept_encoding
+    })
+
+async def test_brotli_preferred(client, auth_headers):
+    response = await list_response(client, auth_headers, "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"].startswith("W/")
+    assert len(response.json()["projects"]) == 20
+
+async def test_gzip_when_brotli_refused(client, auth_headers):
+    response = await list_response(client, auth_headers, "gzip, br;q=0")
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["projects"]) == 20
@@ -0,0 +1,122 @@
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app.core.database import engine
+from app.core.ids import id_allocator
+from app.core.instrumentation import current_stats
+
+# SQL statements issued per project write, so a change that adds a round trip
+# (a lazy load, a per-row query in a bulk path, a separate COUNT) fails here.
+# Only statements run while serving a request are counted; background tasks
+# (last_login flushes) share the engine.
+
+pytestmark = pytest.mark.anyio
+
+@contextmanager
+def statements():
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_stats() is not None:
+            executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield executed
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture
+async def headers(client, auth_headers):
+    # Loads the principal, the tenant's shard and an id block once, so the
+    # counts below are those of a warmed-up worker
+    response = await client.post("/api/v1/projects/", json={"name": "warm-up"}, headers=auth_headers)
+    assert response.status_code == 201, response.text
+    return auth_headers
+
+async def create(client, headers, name="project", **fields):
+    response = await client.post("/api/v1/projects/", json={"name": name, **fields}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+async def test_create(client, headers):
+    with statements() as executed:
+        await create(client, headers)
+    # INSERT ... RETURNING, counters upsert
+    assert len(executed) == 2, executed
+
+async def test_create_reserving_an_id_block(client, headers, monkeypatch):
+    monkeypatch.setattr(id_allocator, "_blocks", {})
+    with statements() as executed:
+        await create(client, headers)
+    # One extra UPDATE ... RETURNING of id_sequences, once per ID_BLOCK_SIZE ids
+    assert len(executed) == 3, executed
+    assert sum("id_sequences" in statement for statement in executed) == 1
+
+async def test_update_fields(client, headers):
+    project = await create(client, headers)
+    with statements() as executed:
+        response = await client.put(f"/api/v1/projects/{project['id']}", json={"name": "renamed"}, headers=headers)
+    assert response.status_code == 200, response.text
+    # UPDATE ... RETURNING
+    assert len(executed) == 1, executed
+
+async def test_update_status(client, headers):
+    project = await create(client, headers)
+    with statements() as executed:
+        response = await client.put(f"/api/v1/projects/{project['id']}", json={"status": "archived"}, headers=headers)
+    assert response.status_code == 200, response.text
+    # Previous status, UPDATE ... RETURNING, counters upsert
+    assert len(executed) == 3, executed
+
+async def test_delete(client, headers):
+    project = await create(client, headers)
+    with statements() as executed:
+        response = await client.delete(f"/api/v1/projects/{project['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+    # DELETE ... RETURNING, counters upsert
+    assert len(executed) == 2, executed
+
+@pytest.mark.parametrize("size", [1, 20])
+async def test_bulk_create(client, headers, size):
+    with statements() as executed:
+        response = await client.post(
+            "/api/v1/projects/bulk", json=[{"name": f"bulk {i}"} for i in range(size)], headers=headers
+        )
+    assert response.status_code == 201, response.text
+    # One multi-row INSERT ... RETURNING, counters upsert
+    assert len(executed) == 2, executed
+    # Results still come back in request order
+    assert [item["project"]["name"] for item in response.json()["results"]] == [f"bulk {i}" for i in range(size)]
+
+@pytest.mark.parametrize("size", [1, 20])
+async def test_bulk_update(client, headers, size):
+    ids = [(await create(client, headers, f"bulk {i}"))["id"] for i in range(size)]
+    with statements() as executed:
+        response = await client.patch("/api/v1/projects/bulk", json=[
+            {"id": project_id, "description": "changed"} for project_id in ids
+        ], headers=headers)
+    assert response.status_code == 200, response.text
+    # One UPDATE for the group, read-back SELECT
+    assert len(executed) == 2, executed
+
+@pytest.mark.parametrize("size", [1, 20])
+async def test_bulk_update_status(client, headers, size):
+    ids = [(await create(client, headers, f"bulk {i}"))["id"] for i in range(size)]
+    with statements() as executed:
+        response = await client.patch("/api/v1/projects/bulk", json=[
+            {"id": project_id, "status": "archived"} for project_id in ids
+        ] + [{"id": ids[0], "name": "renamed"}], headers=headers)
+    assert response.status_code == 200, response.text
+    # Previous statuses, one UPDATE per group of fields, read-back SELECT,
+    # counters upsert
+    assert len(executed) == 5, executed
+
+@pytest.mark.parametrize("size", [1, 20])
+async def test_bulk_delete(client, headers, size):
+    ids = [(await create(client, headers, f"bulk {i}"))["id"] for i in range(size)]
+    with statements() as executed:
+        response = await client.request("DELETE", "/api/v1/projects/bulk", json={"ids": ids}, headers=headers)
+    assert response.status_code == 200, response.text
+    # DELETE ... RETURNING, counters upsert
+    assert len(executed) == 2, executed
@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy import update
+from app.core.cache import cache
+from app.core.database import AsyncSessionLocal
+from app.models.project import Project
+
+# A project write must show up in the very next read of the same tenant, both
+# when reads are served from the in-process L1 tier and when they come from
+# the shared L2 tier (another worker's view). Every read below is first made
+# once before the write, so a stale cached page or item would be returned if
+# the write failed to invalidate it.
+
+pytestmark = pytest.mark.anyio
+
+async def read(client, auth_headers, cache_tier, url, headers=None, **kwargs):
+    if cache_tier == "l2":
+        # Nothing in this process's L1: the request is answered from L2
+        cache.l1.clear()
+    return await client.get(url, headers={**auth_headers, **(headers or {})}, **kwargs)
+
+async def list_ids(client, headers, cache_tier):
+    response = await read(client, headers, cache_tier, "/api/v1/projects/")
+    assert response.status_code == 200, response.text
+    return [project["id"] for project in response.json()["projects"]]
+
+async def create(client, headers, name):
+    response = await client.post("/api/v1/projects/", json={"name": name}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+async def test_create_is_visible_in_next_list(client, auth_headers, cache_tier):
+    first = await create(client, auth_headers, "first")
+    assert await list_ids(client, auth_headers, cache_tier) == [first["id"]]
+    assert await list_ids(client, auth_headers, cache_tier) == [first["id"]]
+    if cache_tier == "l2":
+        assert cache.l2_hits > 0
+
+    second = await create(client, auth_headers, "second")
+
+    assert sorted(await list_ids(client, auth_headers, cache_tier)) == sorted([first["id"], second["id"]])
+    response = await read(client, auth_headers, cache_tier, "/api/v1/projects/stats")
+    assert response.json()["total"] == 2
+
+async def test_create_changes_list_etag(client, auth_headers, cache_tier):
+    await create(client, auth_headers, "first")
+    response = await read(client, auth_headers, cache_tier, "/api/v1/projects/")
+    etag = response.headers["etag"]
+    response = await read(client, auth_headers, cache_tier, "/api/v1/projects/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await create(client, auth_headers, "second")
+
+    response = await read(client, auth_headers, cache_tier, "/api/v1/projects/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+
+async def test_update_is_visible_in_next_get_and_list(client, auth_headers, cache_tier):
+    project = await create(client, auth_headers, "before")
+    url = f"/api/v1/projects/{project['id']}"
+    assert (await read(client, auth_headers, cache_tier, url)).json()["name"] == "before"
+    response = await read(client, auth_headers, cache_tier, "/api/v1/projects/")
+    assert [p["name"] for p in response.json()["projects"]] == ["before"]
+
+    response = await client.put(url, json={"name": "after", "status": "archived"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    response = await read(client, auth_headers, cache_tier, url)
+    assert response.json()["name"] == "after"
+    assert response.json()["status"] == "archived"
+    response = await read(client, auth_headers, cache_tier, "/api/v1/projects/")
+    assert [p["name"] for p in response.json()["projects"]] == ["after"]
+    response = await read(client, auth_headers, cache_tier, "/api/v1/projects/", params={"status": "archived"})
+    assert response.json()["total"] == 1
+
+async def test_delete_is_visible_in_next_get_and_list(client, auth_headers, cache_tier):
+    kept = await create(client, auth_headers, "kept")
+    deleted = await create(client, auth_headers, "deleted")
+    url = f"/api/v1/projects/{deleted['id']}"
+    assert (await read(client, auth_headers, cache_tier, url)).status_code == 200
+    assert len(await list_ids(client, auth_headers, cache_tier)) == 2
+
+    response = await client.delete(url, headers=auth_headers)
+    assert response.status_code == 204, response.text
+
+    assert (await read(client, auth_headers, cache_tier, url)).status_code == 404
+    assert await list_ids(client, auth_headers, cache_tier) == [kept["id"]]
+
+async def test_bulk_writes_are_visible_in_next_list(client, auth_headers, cache_tier):
+    response = await client.post("/api/v1/projects/bulk", json=[
+        {"name": f"bulk {i}"} for i in range(3)
+    ], headers=auth_headers)
+    assert response.status_code == 201, response.text
+    ids = sorted(await list_ids(client, auth_headers, cache_tier))
+    assert len(ids) == 3
+
+    response = await client.request("DELETE", "/api/v1/projects/bulk", json={"ids": ids[:2]}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    assert await list_ids(client, auth_headers, cache_tier) == ids[2:]
+
+async def test_write_by_another_worker_is_visible_without_l2(client, auth_headers):
+    # Without a shared tier the generation is per process, so a write made
+    # elsewhere (here straight through the database) must still change the
+    # ETags and cached pages this worker serves
+    cache.clear()
+    project = await create(client, auth_headers, "v1")
+    url = f"/api/v1/projects/{project['id']}"
+    item_etag = (await client.get(url, headers=auth_headers)).headers["etag"]
+    list_etag = (await client.get("/api/v1/projects/", headers=auth_headers)).headers["etag"]
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(Project).where(Project.id == project["id"]).values(name="v2"))
+        await session.commit()
+
+    response = await client.get(url, headers={**auth_headers, "If-None-Match": item_etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "v2"
+    response = await client.get("/api/v1/projects/", headers={**auth_headers, "If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()["projects"]] == ["v2"]